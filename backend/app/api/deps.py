@@ -1,8 +1,10 @@
-from fastapi import Depends, HTTPException
+from typing import Optional
+from fastapi import Depends, HTTPException, Query
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from app.core.config import settings
-from app.core.prisma import prisma
+from app.core.fieldsets import TalkFieldset, parse_talk_fieldset
+from app.core.principal import resolve_principal
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
@@ -13,11 +15,20 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
         user_id = payload.get("sub")
         if not user_id:
             raise HTTPException(status_code=401, detail="Token invalide.")
-        user = await prisma.utilisateur.find_unique(
-            where={"id_utilisateur": int(user_id)}
-        )
+        user = await resolve_principal(int(user_id), payload)
         if not user:
             raise HTTPException(status_code=404, detail="Utilisateur non trouvé.")
         return user
     except JWTError:
         raise HTTPException(status_code=401, detail="Token invalide.")
+
+
+def talk_fieldset(
+    fields: Optional[str] = Query(
+        None, description="Champs à renvoyer, séparés par des virgules"
+    ),
+    include: Optional[str] = Query(
+        None, description="Relations à intégrer : conferencier, planning"
+    ),
+) -> TalkFieldset:
+    return parse_talk_fieldset(fields, include)
@@ -3,9 +3,14 @@ from fastapi import APIRouter, HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordRequestForm
 from pydantic import BaseModel
 from app.core.prisma import prisma
-from app.core.security import create_access_token, verify_password, hash_password
+from app.core.principal import invalidate_user
+from app.core.security import (
+    ACCESS_TOKEN_EXPIRE,
+    create_access_token,
+    hash_password_async,
+    verify_and_update_async,
+)
 from app.models.utilisateur import UtilisateurCreate, UtilisateurOut
-from datetime import timedelta
 
 router = APIRouter()
 
@@ -22,7 +27,7 @@ async def register_user(user: UtilisateurCreate):
     if existing_user:
         raise HTTPException(status_code=400, detail="Email déjà utilisé.")
 
-    hashed_password = hash_password(user.mot_de_passe)
+    hashed_password = await hash_password_async(user.mot_de_passe)
     new_user = await prisma.utilisateur.create(
         {
             "nom": user.nom,
@@ -31,6 +36,7 @@ async def register_user(user: UtilisateurCreate):
             "id_role": user.id_role,
         }
     )
+    invalidate_user(new_user.id_utilisateur)
     return new_user
 
 
@@ -40,19 +46,30 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
     user = await prisma.utilisateur.find_unique(
         where={"email": form_data.username}
     )  # username non unique
-    if not user or not verify_password(form_data.password, user.mot_de_passe):
+    valid, new_hash = False, None
+    if user:
+        valid, new_hash = await verify_and_update_async(
+            form_data.password, user.mot_de_passe
+        )
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Identifiants invalides",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    # Re-hash opportuniste si le coût bcrypt a changé depuis le dernier hash
+    if new_hash:
+        await prisma.utilisateur.update(
+            where={"id_utilisateur": user.id_utilisateur},
+            data={"mot_de_passe": new_hash},
+        )
+
     # Créer un token JWT
-    access_token_expires = timedelta(hours=1)  # Expire après 1 heure
     access_token = create_access_token(
         data={"sub": str(user.id_utilisateur)},
         utilisateur=user,
-        expires_delta=access_token_expires,
+        expires_delta=ACCESS_TOKEN_EXPIRE,  # Expire après 1 heure
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
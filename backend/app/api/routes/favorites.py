@@ -0,0 +1,127 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from prisma.models import Utilisateur
+from typing import List
+from app.api.deps import get_current_user
+from app.core.http_cache import conditional_get
+from app.core.invalidation import notify
+from app.core.prisma import prisma
+from app.models.favori import AgendaItem, FavoriOut, TalkPopulaire
+
+router = APIRouter()
+
+# Seuls les talks retenus sont visibles de tous : un talk en attente ou
+# refusé ne peut être ni mis en favori ni apparaître dans le classement
+STATUTS_VISIBLES = ["ACCEPTE", "PLANIFIE"]
+
+
+# Insertion et compteur dans une seule requête : idempotent (ON CONFLICT)
+# et le compteur n'est incrémenté que si la ligne a réellement été créée.
+AJOUT_FAVORI_SQL = """
+WITH ajout AS (
+    INSERT INTO "Favori" (id_utilisateur, id_talk) VALUES ($1, $2)
+    ON CONFLICT (id_utilisateur, id_talk) DO NOTHING
+    RETURNING id_talk
+)
+UPDATE "Talk" SET nb_favoris = nb_favoris + (SELECT count(*) FROM ajout)
+WHERE id_talk = $2
+RETURNING nb_favoris
+"""
+
+RETRAIT_FAVORI_SQL = """
+WITH retrait AS (
+    DELETE FROM "Favori" WHERE id_utilisateur = $1 AND id_talk = $2
+    RETURNING id_talk
+)
+UPDATE "Talk" SET nb_favoris = nb_favoris - (SELECT count(*) FROM retrait)
+WHERE id_talk = $2
+RETURNING nb_favoris
+"""
+
+AGENDA_SQL = """
+SELECT t.id_talk, t.titre, t.sujet, t.niveau::text AS niveau, t.duree,
+       p.id_planning, p.date_heure, p.id_salle, s.nom_salle
+FROM "Favori" f
+JOIN "Talk" t ON t.id_talk = f.id_talk
+LEFT JOIN "Planning" p ON p.id_talk = t.id_talk
+LEFT JOIN "Salle" s ON s.id_salle = p.id_salle
+WHERE f.id_utilisateur = $1
+ORDER BY p.date_heure NULLS LAST, t.id_talk
+"""
+
+
+async def _toggle(sql: str, id_talk: int, id_utilisateur: int) -> int:
+    rows = await prisma.query_raw(sql, id_utilisateur, id_talk)
+    if not rows:
+        raise HTTPException(status_code=404, detail="Talk non trouvé")
+    return rows[0]["nb_favoris"]
+
+
+@router.put("/{id_talk}", response_model=FavoriOut)
+async def add_favori(
+    id_talk: int, current_user: Utilisateur = Depends(get_current_user)
+):
+    """
+    Ajoute un talk accepté ou planifié aux favoris de l'utilisateur connecté
+    (sans effet s'il y est déjà).
+    """
+    talk = await prisma.talk.find_unique(where={"id_talk": id_talk})
+    if not talk or talk.statut not in STATUTS_VISIBLES:
+        raise HTTPException(status_code=404, detail="Talk non trouvé")
+
+    nb_favoris = await _toggle(AJOUT_FAVORI_SQL, id_talk, current_user.id_utilisateur)
+    notify("favoris")
+    return FavoriOut(id_talk=id_talk, favori=True, nb_favoris=nb_favoris)
+
+
+@router.delete("/{id_talk}", response_model=FavoriOut)
+async def remove_favori(
+    id_talk: int, current_user: Utilisateur = Depends(get_current_user)
+):
+    """
+    Retire un talk des favoris de l'utilisateur connecté (sans effet s'il n'y est pas).
+    """
+    nb_favoris = await _toggle(RETRAIT_FAVORI_SQL, id_talk, current_user.id_utilisateur)
+    notify("favoris")
+    return FavoriOut(id_talk=id_talk, favori=False, nb_favoris=nb_favoris)
+
+
+@router.get("/", response_model=List[int])
+async def list_favoris(current_user: Utilisateur = Depends(get_current_user)):
+    """
+    Identifiants des talks favoris de l'utilisateur connecté.
+    """
+    favoris = await prisma.favori.find_many(
+        where={"id_utilisateur": current_user.id_utilisateur},
+        order={"id_talk": "asc"},
+    )
+    return [favori.id_talk for favori in favoris]
+
+
+@router.get("/agenda", response_model=List[AgendaItem])
+async def my_agenda(current_user: Utilisateur = Depends(get_current_user)):
+    """
+    Talks favoris de l'utilisateur avec leur créneau, en une seule requête.
+    """
+    return await prisma.query_raw(AGENDA_SQL, current_user.id_utilisateur)
+
+
+@router.get("/top", response_model=List[TalkPopulaire])
+async def top_talks(
+    request: Request,
+    response: Response,
+    limit: int = Query(10, ge=1, le=100),
+    current_user: Utilisateur = Depends(get_current_user),
+):
+    """
+    Talks acceptés ou planifiés les plus mis en favoris, lus sur le compteur
+    indexé `nb_favoris`.
+    """
+    not_modified = conditional_get(request, response, "favoris", "talks")
+    if not_modified:
+        return not_modified
+
+    return await prisma.talk.find_many(
+        where={"statut": {"in": STATUTS_VISIBLES}},
+        order=[{"nb_favoris": "desc"}, {"id_talk": "asc"}],
+        take=limit,
+    )
@@ -0,0 +1,89 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from prisma.models import Utilisateur
+from datetime import datetime, timezone
+from app.api.deps import get_current_user
+from app.core.feedback import FeedbackEnAttente, feedback_buffer
+from app.core.prisma import prisma
+from app.models.feedback import FeedbackCreate, FeedbackRecu, NotesOut
+
+router = APIRouter()
+
+
+def _notes_out(agregat) -> NotesOut:
+    # Agrégat NoteTalk / NoteConferencier : lecture d'une ligne, sans calcul
+    if agregat is None:
+        return NotesOut(nb=0, moyenne=None, histogramme={n: 0 for n in range(1, 6)})
+    return NotesOut(
+        nb=agregat.nb,
+        moyenne=round(agregat.somme / agregat.nb, 2) if agregat.nb else None,
+        histogramme={n: getattr(agregat, f"note_{n}") for n in range(1, 6)},
+    )
+
+
+@router.post("/", response_model=FeedbackRecu, status_code=status.HTTP_202_ACCEPTED)
+async def submit_feedback(
+    feedback: FeedbackCreate,
+    current_user: Utilisateur = Depends(get_current_user),
+):
+    """
+    Enregistre la note d'un utilisateur pour un talk (une seule par talk :
+    un nouvel envoi remplace le précédent). L'écriture en base se fait par
+    lots ; les feedbacks sur un talk inexistant sont ignorés.
+    """
+    feedback_buffer.submit(
+        FeedbackEnAttente(
+            id_utilisateur=current_user.id_utilisateur,
+            id_talk=feedback.id_talk,
+            note=feedback.note,
+            commentaire=feedback.commentaire,
+            date_feedback=datetime.now(timezone.utc).replace(tzinfo=None),
+        )
+    )
+    return FeedbackRecu(
+        id_talk=feedback.id_talk,
+        note=feedback.note,
+        en_attente=len(feedback_buffer),
+    )
+
+
+@router.get("/talks/{id_talk}", response_model=NotesOut)
+async def get_talk_notes(
+    id_talk: int, current_user: Utilisateur = Depends(get_current_user)
+):
+    """
+    Nombre de notes, moyenne et répartition des notes d'un talk.
+    """
+    return _notes_out(await prisma.notetalk.find_unique(where={"id_talk": id_talk}))
+
+
+@router.get("/conferenciers/{id_conferencier}", response_model=NotesOut)
+async def get_conferencier_notes(
+    id_conferencier: int, current_user: Utilisateur = Depends(get_current_user)
+):
+    """
+    Notes reçues par un conférencier sur l'ensemble de ses talks.
+    Accessible au conférencier lui-même, aux organisateurs et aux administrateurs.
+    """
+    is_self = current_user.id_utilisateur == id_conferencier
+    if not is_self and current_user.id_role not in (2, 4):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Accès réservé au conférencier et aux organisateurs.",
+        )
+    return _notes_out(
+        await prisma.noteconferencier.find_unique(
+            where={"id_conferencier": id_conferencier}
+        )
+    )
+
+
+@router.get("/me", response_model=NotesOut)
+async def get_my_notes(current_user: Utilisateur = Depends(get_current_user)):
+    """
+    Notes reçues par le conférencier connecté.
+    """
+    return _notes_out(
+        await prisma.noteconferencier.find_unique(
+            where={"id_conferencier": current_user.id_utilisateur}
+        )
+    )
@@ -0,0 +1,97 @@
+from fastapi import APIRouter, Request, Response
+from typing import Optional
+from app.core.cache import ReadThroughCache
+from app.core.config import settings
+from app.core.http_cache import conditional_get
+from app.core.ical import EvenementIcs, render_calendar, timestamp_to_datetime
+from app.core.invalidation import modified_at
+from app.core.prisma import prisma
+
+router = APIRouter()
+
+# Sujets dont dépend le contenu d'un flux : toute autre écriture le laisse en cache
+FEED_TOPICS = ("plannings", "talks", "salles")
+
+_feeds_cache = ReadThroughCache(
+    ttl=settings.ICS_CACHE_TTL, topics=FEED_TOPICS, maxsize=settings.ICS_CACHE_MAXSIZE
+)
+
+
+def _enum_value(value) -> str:
+    return getattr(value, "value", value)
+
+
+async def _render(nom: str, where: Optional[dict]) -> bytes:
+    plannings = await prisma.planning.find_many(
+        where=where or {},
+        include={"talk": {"include": {"conferencier": True}}, "salle": True},
+        order={"date_heure": "asc"},
+    )
+    evenements = [
+        EvenementIcs(
+            uid=f"planning-{planning.id_planning}@talkmaster",
+            debut=planning.date_heure,
+            duree=planning.talk.duree,
+            titre=planning.talk.titre,
+            lieu=planning.salle.nom_salle,
+            description="\n".join(
+                [
+                    f"{planning.talk.sujet} ({_enum_value(planning.talk.niveau)})",
+                    f"Conférencier : {planning.talk.conferencier.nom}",
+                    "",
+                    planning.talk.description,
+                ]
+            ),
+        )
+        for planning in plannings
+    ]
+    dtstamp = timestamp_to_datetime(max(modified_at(t) for t in FEED_TOPICS))
+    return render_calendar(nom, evenements, dtstamp)
+
+
+async def _feed(request: Request, response: Response, key, nom: str, where):
+    not_modified = conditional_get(request, response, *FEED_TOPICS)
+    if not_modified:
+        return not_modified
+    body = await _feeds_cache.get(key, lambda: _render(nom, where))
+    return Response(
+        content=body,
+        media_type="text/calendar; charset=utf-8",
+        headers=dict(response.headers),
+    )
+
+
+@router.get("/planning.ics")
+async def planning_feed(request: Request, response: Response):
+    """
+    Planning complet au format iCalendar, pour abonnement.
+    """
+    return await _feed(request, response, "planning", "TalkMaster", None)
+
+
+@router.get("/salles/{id_salle}.ics")
+async def salle_feed(id_salle: int, request: Request, response: Response):
+    """
+    Talks programmés dans une salle.
+    """
+    return await _feed(
+        request,
+        response,
+        ("salle", id_salle),
+        f"TalkMaster - salle {id_salle}",
+        {"id_salle": id_salle},
+    )
+
+
+@router.get("/conferenciers/{id_conferencier}.ics")
+async def conferencier_feed(id_conferencier: int, request: Request, response: Response):
+    """
+    Talks programmés d'un conférencier.
+    """
+    return await _feed(
+        request,
+        response,
+        ("conferencier", id_conferencier),
+        f"TalkMaster - conférencier {id_conferencier}",
+        {"talk": {"is": {"id_conferencier": id_conferencier}}},
+    )
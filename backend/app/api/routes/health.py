@@ -0,0 +1,30 @@
+import os
+from fastapi import APIRouter, Response, status
+from app.core import health
+
+router = APIRouter()
+
+
+@router.get("/healthz", include_in_schema=False)
+async def healthz():
+    """
+    Vivacité : le worker répond, sans interroger la base.
+    """
+    return {"status": "ok"}
+
+
+@router.get("/readyz", include_in_schema=False)
+async def readyz(response: Response):
+    """
+    Disponibilité : 503 tant que la base ne répond pas.
+    """
+    database = await health.database_ready()
+    if not database:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {
+        "status": "ready" if database else "unavailable",
+        "database": database,
+        "pid": os.getpid(),
+        "startup_seconds": health.startup_seconds,
+        "memory_bytes": health.memory_bytes(),
+    }
@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Response
+from app.core.health import memory_bytes
+from app.core.metrics import process_memory, render_metrics
+from app.core.prisma import prisma
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """
+    Métriques au format d'exposition texte Prometheus : celles de
+    l'application, suivies de celles du moteur Prisma (pool de connexions).
+    """
+    process_memory.set(value=memory_bytes())
+    body = render_metrics()
+    if prisma.is_connected():
+        body += await prisma.get_metrics(format="prometheus")
+    return Response(content=body, media_type="text/plain; version=0.0.4")
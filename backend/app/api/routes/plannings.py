@@ -1,16 +1,136 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Request,
+    Response,
+    status,
+    Query,
+)
+from fastapi.responses import StreamingResponse
 from app.api.deps import get_current_user
+from app.core.config import settings
+from app.core.events import broker, publish_planning
+from app.core.filters import planning_filters
+from app.core.http_cache import conditional_get
+from app.core.invalidation import notify
 from app.core.prisma import prisma
-from app.models.planning import PlanningOut, PlanningUpdate
+from app.core.serialize import FastJSONResponse, dumps, planning_row
+from app.core.solver import Grille, SalleASolver, TalkASolver, solve
+from app.core.schedule import (
+    ScheduleIndex,
+    day_window,
+    find_conflicts,
+    load_room_schedule,
+    load_schedule,
+    naive_utc,
+)
+from app.models.planning import (
+    BatchConflict,
+    CreneauLibre,
+    PlanningBatch,
+    PlanningBatchResult,
+    PlanningAssignment,
+    PlanningOut,
+    PlanningUpdate,
+    SolvePreview,
+    SolveRequest,
+)
 from typing import List, Optional
-from datetime import date, datetime, time
-
+from datetime import date, datetime, time, timedelta
 
 router = APIRouter()
 
 
+PLANNING_RANGE_SQL = """
+SELECT p.id_planning, p.id_talk, p.id_salle, p.date_heure,
+       t.titre, t.statut::text AS statut, t.duree, {description} AS description,
+       s.nom_salle
+FROM "Planning" p
+JOIN "Talk" t ON t.id_talk = p.id_talk
+JOIN "Salle" s ON s.id_salle = p.id_salle
+WHERE p.date_heure >= $1::timestamp AND p.date_heure < $2::timestamp
+  AND (p.date_heure, p.id_planning) > ($3::timestamp, $4::int)
+  {salle}
+ORDER BY p.date_heure, p.id_planning
+LIMIT {limit}
+"""
+
+
+async def _stream_planning_range(
+    debut: datetime, fin: datetime, salle: Optional[int], description: bool
+):
+    """
+    Parcourt la plage [debut, fin) par blocs ordonnés sur (date_heure, id_planning)
+    et émet le tableau JSON au fil de l'eau : la mémoire reste constante.
+    """
+    sql = PLANNING_RANGE_SQL.format(
+        description="t.description" if description else "NULL",
+        salle="AND p.id_salle = $5::int" if salle is not None else "",
+        limit=settings.PLANNING_STREAM_CHUNK,
+    )
+    params = [] if salle is None else [salle]
+    apres = (debut.isoformat(), 0)
+    separateur = b"["
+    while True:
+        rows = await prisma.query_raw(
+            sql, debut.isoformat(), fin.isoformat(), *apres, *params
+        )
+        for row in rows:
+            date_heure = datetime.fromisoformat(row["date_heure"])
+            yield separateur + dumps(
+                {
+                    "id_planning": row["id_planning"],
+                    "talk_id": row["id_talk"],
+                    "talk_titre": row["titre"],
+                    "talk_description": row["description"],
+                    "talk_statut": row["statut"],
+                    "talk_duree": row["duree"],
+                    "salle_nom": row["nom_salle"],
+                    "salle_id": row["id_salle"],
+                    "date": date_heure.date().isoformat(),
+                    "heure": date_heure.strftime("%H:%M"),
+                }
+            )
+            separateur = b","
+        if len(rows) < settings.PLANNING_STREAM_CHUNK:
+            break
+        apres = (rows[-1]["date_heure"], rows[-1]["id_planning"])
+    yield b"[]" if separateur == b"[" else b"]"
+
+
 @router.get("/", response_model=List[PlanningOut])
-async def get_planning():
+async def get_planning(
+    request: Request,
+    response: Response,
+    debut: Optional[datetime] = Query(None, alias="from"),
+    fin: Optional[datetime] = Query(None, alias="to"),
+    salle: Optional[int] = Query(None),
+    description: bool = Query(False),
+):
+    """
+    Planning complet, ou avec `from`/`to` (et éventuellement `salle`) la seule
+    plage affichée : filtrée en base sur `date_heure`, limitée aux colonnes
+    utiles (description du talk seulement si `description=true`) et renvoyée
+    en flux.
+    """
+    # 304 sans requête en base si le planning n'a pas changé
+    not_modified = conditional_get(request, response, "plannings", "talks", "salles")
+    if not_modified:
+        return not_modified
+
+    if debut is not None or fin is not None:
+        if debut is None or fin is None or fin <= debut:
+            raise HTTPException(status_code=400, detail="Plage de dates invalide.")
+        return StreamingResponse(
+            _stream_planning_range(
+                naive_utc(debut), naive_utc(fin), salle, description
+            ),
+            media_type="application/json",
+            headers=dict(response.headers),
+        )
+
     plannings = await prisma.planning.find_many(
         include={
             "talk": True,  # Récupère tout le talk
@@ -21,23 +141,268 @@ async def get_planning():
     if not plannings:
         raise HTTPException(status_code=404, detail="Aucun planning trouvé.")
 
-    # Adapter les données à PlanningOut avec les bons formats pour date et heure
+    # Date 'YYYY-MM-DD' et heure 'HH:MM', comme PlanningOut
+    return FastJSONResponse(
+        [planning_row(planning) for planning in plannings],
+        headers=dict(response.headers),
+    )
+
+
+@router.get("/free-slots", response_model=List[CreneauLibre])
+async def get_free_slots(
+    salle: int = Query(...),
+    jour: date = Query(...),
+    duree: int = Query(0, ge=0),
+    current_user=Depends(get_current_user),
+):
+    """
+    Liste les créneaux libres d'une salle sur la journée ouvrée,
+    d'au moins `duree` minutes.
+    """
+    debut, fin = day_window(jour)
+    index = await load_room_schedule(salle, debut, fin)
     return [
-        PlanningOut(
-            id_planning=planning.id_planning,
-            talk_id=planning.talk.id_talk,
-            talk_titre=planning.talk.titre,
-            talk_description=planning.talk.description,
-            talk_statut=planning.talk.statut,
-            salle_nom=planning.salle.nom_salle,
-            date=planning.date_heure.date().isoformat(),  # Conversion en string au format 'YYYY-MM-DD'
-            heure=planning.date_heure.time().strftime(
-                "%H:%M"
-            ),  # Conversion en string au format 'HH:MM'
-            salle_id=planning.id_salle,
+        CreneauLibre(
+            debut=libre_debut,
+            fin=libre_fin,
+            duree=int((libre_fin - libre_debut).total_seconds() // 60),
+        )
+        for libre_debut, libre_fin in index.free_slots(salle, debut, fin, duree)
+    ]
+
+
+@router.post("/batch", response_model=PlanningBatchResult)
+async def schedule_batch(
+    batch: PlanningBatch,
+    all_or_nothing: bool = Query(False),
+    current_user=Depends(get_current_user),
+):
+    """
+    Planifie plusieurs talks acceptés en une fois.
+    Les affectations sont validées en mémoire entre elles et contre le planning
+    existant, puis les affectations valides sont écrites dans une seule transaction.
+    Avec `all_or_nothing`, rien n'est écrit si une affectation est rejetée.
+    """
+    if current_user.id_role == 1 or current_user.id_role == 3:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Seuls les organisateurs peuvent assigner des salles et des créneaux.",
+        )
+
+    assignments = batch.assignments
+    if not assignments:
+        return PlanningBatchResult(planifies=[], conflits=[])
+
+    starts = [datetime.combine(a.date, a.heure) for a in assignments]
+    talk_ids = {a.id_talk for a in assignments}
+    salle_ids = {a.salle_id for a in assignments}
+
+    talks = {
+        talk.id_talk: talk
+        for talk in await prisma.talk.find_many(
+            where={"id_talk": {"in": list(talk_ids)}}
+        )
+    }
+    salles = {
+        salle.id_salle
+        for salle in await prisma.salle.find_many(
+            where={"id_salle": {"in": list(salle_ids)}}
+        )
+    }
+    fin_max = max(starts) + timedelta(
+        minutes=max((talk.duree for talk in talks.values()), default=0)
+    )
+    index = await load_schedule(salle_ids, min(starts), fin_max)
+
+    accepted, conflicts = _validate_batch(index, assignments, starts, talks, salles)
+
+    if all_or_nothing and conflicts:
+        accepted = []
+
+    if accepted:
+        await _write_assignments(accepted, current_user.id_utilisateur)
+
+    return PlanningBatchResult(
+        planifies=[assignment for assignment, _ in accepted],
+        conflits=conflicts,
+    )
+
+
+async def _write_assignments(accepted: list, id_organisateur: int) -> None:
+    """
+    Écrit les affectations (talk planifié + planning créé ou déplacé)
+    dans une seule transaction.
+    """
+    async with prisma.batch_() as batcher:
+        for assignment, date_heure in accepted:
+            batcher.talk.update(
+                where={"id_talk": assignment.id_talk},
+                data={"statut": "PLANIFIE"},
+            )
+            batcher.planning.upsert(
+                where={"id_talk": assignment.id_talk},
+                data={
+                    "create": {
+                        "id_talk": assignment.id_talk,
+                        "id_salle": assignment.salle_id,
+                        "date_heure": date_heure,
+                        "id_organisateur": id_organisateur,
+                    },
+                    "update": {
+                        "id_salle": assignment.salle_id,
+                        "date_heure": date_heure,
+                    },
+                },
+            )
+    notify("talks", "plannings")
+    # Trop de changements pour un diff : les clients rechargent leur plage
+    broker.publish("resync", {})
+
+
+@router.post("/solve", response_model=SolvePreview)
+async def solve_planning(
+    request: SolveRequest,
+    commit: bool = Query(False),
+    current_user=Depends(get_current_user),
+):
+    """
+    Propose un planning sans conflit pour tous les talks ACCEPTE,
+    sur la grille de jours et d'heures demandée, en évitant les créneaux
+    déjà planifiés. Par défaut la proposition n'est pas enregistrée
+    (elle peut être envoyée telle quelle à POST /plannings/batch) ;
+    avec `commit=true` elle est écrite directement.
+    """
+    if current_user.id_role == 1 or current_user.id_role == 3:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Seuls les organisateurs peuvent assigner des salles et des créneaux.",
+        )
+
+    jours = sorted(set(request.jours))
+    grille = Grille(
+        jours=tuple(jours),
+        debut=request.heure_debut or time.fromisoformat(settings.SCHEDULE_DAY_START),
+        fin=request.heure_fin or time.fromisoformat(settings.SCHEDULE_DAY_END),
+        pas=request.pas,
+    )
+    if grille.fin <= grille.debut:
+        raise HTTPException(status_code=400, detail="Plage horaire invalide.")
+
+    talks = await prisma.talk.find_many(where={"statut": "ACCEPTE"})
+    salles = await prisma.salle.find_many()
+    existing = await load_schedule(
+        None,
+        datetime.combine(jours[0], grille.debut),
+        datetime.combine(jours[-1], grille.fin),
+    )
+    # Les talks à placer peuvent être déplacés : leurs anciens créneaux sont libérés
+    for talk in talks:
+        existing.remove(talk.id_talk)
+
+    affectations, non_places = solve(
+        [TalkASolver(t.id_talk, t.duree, t.niveau, t.sujet) for t in talks],
+        [SalleASolver(s.id_salle, s.capacite) for s in salles],
+        grille,
+        existing=existing,
+        poids_niveau=1.0 if request.repartir_niveau else 0.0,
+        poids_sujet=2.0 if request.repartir_sujet else 0.0,
+    )
+
+    assignments = [
+        PlanningAssignment(
+            id_talk=a.id_talk,
+            salle_id=a.id_salle,
+            date=a.date_heure.date(),
+            heure=a.date_heure.time(),
         )
-        for planning in plannings
+        for a in affectations
     ]
+    if commit and affectations:
+        await _write_assignments(
+            [
+                (assignment, a.date_heure)
+                for assignment, a in zip(assignments, affectations)
+            ],
+            current_user.id_utilisateur,
+        )
+
+    return SolvePreview(assignments=assignments, non_places=non_places)
+
+
+def _validate_batch(
+    index: ScheduleIndex,
+    assignments: list,
+    starts: list[datetime],
+    talks: dict,
+    salles: set[int],
+) -> tuple[list, list[BatchConflict]]:
+    """
+    Valide les affectations dans l'ordre en les ajoutant à l'index :
+    chacune est confrontée au planning existant et aux précédentes du lot.
+    """
+    accepted = []
+    conflicts = []
+    seen = set()
+
+    for i, (assignment, date_heure) in enumerate(zip(assignments, starts)):
+        talk = talks.get(assignment.id_talk)
+        detail, overlapping = None, []
+        if talk is None:
+            detail = "Talk non trouvé."
+        elif talk.statut != "ACCEPTE":
+            detail = "Le talk n'est pas accepté, impossible d'assigner une salle."
+        elif assignment.id_talk in seen:
+            detail = "Talk présent plusieurs fois dans le lot."
+        elif assignment.salle_id not in salles:
+            detail = "Salle non trouvée."
+        else:
+            overlapping = index.conflicts(
+                assignment.salle_id,
+                date_heure,
+                talk.duree,
+                ignore_talk=assignment.id_talk,
+            )
+            if overlapping:
+                detail = "La salle est déjà réservée pour ce créneau."
+
+        if detail:
+            conflicts.append(
+                BatchConflict(
+                    index=i,
+                    id_talk=assignment.id_talk,
+                    detail=detail,
+                    conflits=[creneau.id_talk for creneau in overlapping],
+                )
+            )
+            continue
+
+        seen.add(assignment.id_talk)
+        index.add(assignment.salle_id, date_heure, talk.duree, assignment.id_talk)
+        accepted.append((assignment, date_heure))
+
+    return accepted, conflicts
+
+
+@router.get("/stream")
+async def stream_planning(
+    last_event_id: Optional[str] = Query(None),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+):
+    """
+    Flux Server-Sent Events des changements du planning : `planning.created`,
+    `planning.moved`, `talk.status`, et `resync` quand le client doit
+    recharger sa vue (reprise impossible, client trop lent, écriture groupée
+    ou faite par un autre worker). Un commentaire `ping` est envoyé toutes
+    les EVENTS_HEARTBEAT secondes.
+
+    La reprise se fait avec l'en-tête `Last-Event-ID` (envoyé automatiquement
+    par EventSource à la reconnexion) ou le paramètre `last_event_id`.
+    """
+    return StreamingResponse(
+        broker.stream(last_event_id_header or last_event_id, settings.EVENTS_HEARTBEAT),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.put("/{id}", response_model=PlanningOut)
@@ -69,27 +434,28 @@ async def update_planning(
     except Exception:
         raise HTTPException(status_code=400, detail="Date ou heure invalide.")
 
-    # Vérification de conflit
-    conflict = await prisma.planning.find_first(
-        where={
-            "id_salle": planning_update.salle_id,
-            "date_heure": date_heure,
-            "NOT": {"id_planning": id},
-        }
+    # Vérification de conflit : chevauchement avec la durée du talk
+    conflicts = await find_conflicts(
+        planning_update.salle_id,
+        date_heure,
+        planning.talk.duree,
+        ignore_talk=planning.id_talk,
     )
-    if conflict:
+    if conflicts:
         raise HTTPException(
             status_code=400, detail="Ce créneau est déjà occupé pour cette salle."
         )
 
     # Mise à jour
-    await prisma.planning.update(
+    moved = await prisma.planning.update(
         where={"id_planning": id},
         data={
             "id_salle": planning_update.salle_id,
             "date_heure": date_heure,
         },
     )
+    notify("plannings")
+    publish_planning("planning.moved", moved)
 
     # Récupérer les informations actualisées pour la réponse
     updated_planning = await prisma.planning.find_unique(
@@ -113,6 +479,8 @@ async def update_planning(
 
 @router.get("/planning", response_model=List[PlanningOut])
 async def get_filtered_planning(
+    request: Request,
+    response: Response,
     jour: Optional[date] = Query(None),  # Optionnel, peut être fourni
     heure: Optional[str] = Query(None),  # Prend l'heure en format string
     salle: Optional[int] = Query(None),
@@ -127,43 +495,30 @@ async def get_filtered_planning(
     if not current_user:
         raise HTTPException(status_code=403, detail="Utilisateur non authentifié")
 
-    filters = {}
+    not_modified = conditional_get(
+        request,
+        response,
+        "plannings",
+        "talks",
+        "salles",
+        vary=date.today().isoformat(),
+    )
+    if not_modified:
+        return not_modified
 
-    # Si jour est fourni, on l'utilise, sinon on prend la date du jour
-    if jour:
-        jour = datetime.combine(jour, time.min)  # Combine jour avec minuit (00:00:00)
-    else:
-        jour = datetime.combine(
-            datetime.today().date(), time.min
-        )  # Si jour non fourni, utiliser la date d'aujourd'hui
+    # Si jour n'est pas fourni, on prend la date du jour
+    jour = jour or date.today()
 
-    # Si une heure est fournie, on la combine avec la date spécifiée (jour)
+    # Si une heure est fournie, on filtre sur le créneau exact
+    heure_creneau = None
     if heure:
-        hour, minute = map(int, heure.split(":"))
-        heure_local = datetime.combine(jour.date(), time(hour, minute))
-
-        filters["date_heure"] = {
-            "equals": heure_local  # Exact match pour la date et l'heure combinées
-        }
-    else:
-        filters["date_heure"] = {
-            "gte": jour,  # Plage de date à partir de minuit
-            "lt": jour.replace(
-                hour=23, minute=59, second=59
-            ),  # Jusqu'à la fin de la journée (23:59:59)
-        }
+        try:
+            hour, minute = map(int, heure.split(":")[:2])
+            heure_creneau = time(hour, minute)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Heure invalide (HH:MM).")
 
-    # Ajouter le filtre sur la salle si fourni
-    if salle:
-        filters["id_salle"] = salle
-
-    # Ajouter le filtre sur le sujet dans les talks si fourni
-    if sujet:
-        filters["talk"] = {"sujet": {"contains": sujet, "mode": "insensitive"}}
-
-    # Ajouter le filtre sur le niveau dans les talks si fourni
-    if niveau:
-        filters["talk"] = {"niveau": niveau}
+    filters = planning_filters(jour, heure_creneau, salle, sujet, niveau)
 
     # Requête Prisma pour récupérer les plannings avec leurs relations (talk et salle)
     plannings = await prisma.planning.find_many(
@@ -171,19 +526,8 @@ async def get_filtered_planning(
         include={"talk": True, "salle": True},
     )
 
-    # Post-traitement pour filtrer les champs nécessaires et s'assurer qu'ils correspondent au modèle
-    filtered_plannings = [
-        {
-            "id_planning": p.id_planning,
-            "date": p.date_heure.date().strftime("%Y-%m-%d"),  # Extrait la date
-            "heure": p.date_heure.time().strftime("%H:%M:%S"),  # Extrait l'heure
-            "talk_id": p.talk.id_talk,
-            "talk_titre": p.talk.titre,
-            "talk_description": p.talk.description,
-            "talk_statut": p.talk.statut,
-            "salle_nom": p.salle.nom_salle,
-        }
-        for p in plannings
-    ]
-
-    return filtered_plannings
+    # Heure avec les secondes ('HH:MM:SS') sur cette route
+    return FastJSONResponse(
+        [planning_row(p, secondes=True) for p in plannings],
+        headers=dict(response.headers),
+    )
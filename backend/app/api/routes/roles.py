@@ -1,14 +1,32 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Response
+from pydantic import TypeAdapter
+from app.core.cache import ReadThroughCache
+from app.core.config import settings
+from app.core.invalidation import notify
 from app.core.prisma import prisma
+from app.core.principal import invalidate_role
 from app.models.role import RoleCreate, RoleOut
 from app.api.deps import get_current_user
 
 router = APIRouter()
 
 
+_roles_adapter = TypeAdapter(list[RoleOut])
+_roles_cache = ReadThroughCache(ttl=settings.REFERENCE_CACHE_TTL, topics=("roles",))
+
+
+async def _load_roles() -> bytes:
+    roles = await prisma.role.find_many()
+    return _roles_adapter.dump_json(
+        _roles_adapter.validate_python(roles, from_attributes=True)
+    )
+
+
 @router.get("/", response_model=list[RoleOut])
 async def get_roles():
-    return await prisma.role.find_many()
+    # JSON déjà sérialisé : ni requête ni validation tant que le cache est valide
+    body = await _roles_cache.get("roles", _load_roles)
+    return Response(content=body, media_type="application/json")
 
 
 @router.post("/", response_model=RoleOut)
@@ -23,4 +41,7 @@ async def create_role(role: RoleCreate, current_user=Depends(get_current_user)):
         )
 
     # Si l'utilisateur est autorisé, créer le rôle
-    return await prisma.role.create({"nom_role": role.nom_role})
+    new_role = await prisma.role.create({"nom_role": role.nom_role})
+    invalidate_role(new_role.id_role)
+    notify("roles")
+    return new_role
@@ -1,4 +1,8 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Response
+from pydantic import TypeAdapter
+from app.core.cache import ReadThroughCache
+from app.core.config import settings
+from app.core.invalidation import notify
 from app.core.prisma import prisma
 from app.models.salle import SalleCreate, SalleOut
 from app.api.deps import get_current_user
@@ -6,9 +10,22 @@ from app.api.deps import get_current_user
 router = APIRouter()
 
 
+_salles_adapter = TypeAdapter(list[SalleOut])
+_salles_cache = ReadThroughCache(ttl=settings.REFERENCE_CACHE_TTL, topics=("salles",))
+
+
+async def _load_salles() -> bytes:
+    salles = await prisma.salle.find_many()
+    return _salles_adapter.dump_json(
+        _salles_adapter.validate_python(salles, from_attributes=True)
+    )
+
+
 @router.get("/", response_model=list[SalleOut])
 async def get_salles():
-    return await prisma.salle.find_many()
+    # JSON déjà sérialisé : ni requête ni validation tant que le cache est valide
+    body = await _salles_cache.get("salles", _load_salles)
+    return Response(content=body, media_type="application/json")
 
 
 @router.post("/", response_model=SalleOut)
@@ -23,6 +40,8 @@ async def create_salle(salle: SalleCreate, current_user=Depends(get_current_user
         )
 
     # Si l'utilisateur est autorisé, créer la salle
-    return await prisma.salle.create(
+    new_salle = await prisma.salle.create(
         {"nom_salle": salle.nom_salle, "capacite": salle.capacite}
     )
+    notify("salles")
+    return new_salle
@@ -0,0 +1,90 @@
+import asyncio
+from fastapi import APIRouter, Depends
+from app.api.deps import get_current_user
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.invalidation import subscribe
+from app.core.prisma import prisma
+from app.models.stats import StatsOut
+from app.models.talk import Niveau, StatutTalk
+
+router = APIRouter()
+
+_stats_cache = TTLCache(maxsize=1, ttl=settings.STATS_CACHE_TTL)
+subscribe("talks", _stats_cache.clear)
+subscribe("plannings", _stats_cache.clear)
+
+OCCUPATION_SALLES_SQL = """
+SELECT s.id_salle, s.nom_salle, s.capacite,
+       COUNT(p.id_planning)::int AS sessions,
+       COALESCE(SUM(t.duree), 0)::int AS minutes
+FROM "Salle" s
+LEFT JOIN "Planning" p ON p.id_salle = s.id_salle
+LEFT JOIN "Talk" t ON t.id_talk = p.id_talk
+GROUP BY s.id_salle
+ORDER BY s.id_salle
+"""
+
+CRENEAUX_PAR_JOUR_SQL = """
+SELECT p.date_heure::date AS jour,
+       COUNT(*)::int AS sessions,
+       COALESCE(SUM(t.duree), 0)::int AS minutes
+FROM "Planning" p
+JOIN "Talk" t ON t.id_talk = p.id_talk
+GROUP BY 1
+ORDER BY 1
+"""
+
+
+def _counts_by(rows: list, field: str, keys) -> dict:
+    counts = {key: 0 for key in keys}
+    for row in rows:
+        counts[row[field]] = row["_count"]["_all"]
+    return counts
+
+
+@router.get("/", response_model=StatsOut)
+async def get_stats(current_user=Depends(get_current_user)):
+    """
+    Compteurs, répartition des talks par statut et niveau, occupation des salles
+    et créneaux utilisés par jour, agrégés en base et mis en cache quelques secondes.
+    """
+    cached = _stats_cache.get("stats")
+    if cached is not None:
+        return cached
+
+    (
+        utilisateurs,
+        talks,
+        plannings,
+        salles,
+        roles,
+        par_statut,
+        par_niveau,
+        occupation_salles,
+        creneaux_par_jour,
+    ) = await asyncio.gather(
+        prisma.utilisateur.count(),
+        prisma.talk.count(),
+        prisma.planning.count(),
+        prisma.salle.count(),
+        prisma.role.count(),
+        prisma.talk.group_by(by=["statut"], count={"_all": True}),
+        prisma.talk.group_by(by=["niveau"], count={"_all": True}),
+        prisma.query_raw(OCCUPATION_SALLES_SQL),
+        prisma.query_raw(CRENEAUX_PAR_JOUR_SQL),
+    )
+
+    stats = StatsOut(
+        utilisateurs=utilisateurs,
+        talks=talks,
+        plannings=plannings,
+        salles=salles,
+        roles=roles,
+        talks_par_statut=_counts_by(par_statut, "statut", StatutTalk),
+        talks_par_niveau=_counts_by(par_niveau, "niveau", Niveau),
+        occupation_salles=occupation_salles,
+        creneaux_par_jour=creneaux_par_jour,
+    )
+    _stats_cache.set("stats", stats)
+    return stats
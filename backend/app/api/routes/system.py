@@ -0,0 +1,12 @@
+from fastapi import APIRouter
+from app.core.prisma import pool_metrics
+
+router = APIRouter()
+
+
+@router.get("/db/pool")
+async def get_pool_metrics():
+    """
+    Taille, délais et occupation du pool de connexions à la base.
+    """
+    return await pool_metrics()
@@ -1,18 +1,56 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Body
-from prisma.models import Utilisateur
-from app.api.deps import get_current_user
-from app.core.prisma import prisma
-from app.models.talk import TalkCreate, TalkOut, TalkUpdate, StatutTalk, Niveau
-from typing import Annotated, List, Optional
-from datetime import datetime, timedelta
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    status,
+    Query,
+    Body,
+    Request,
+    Response,
+    File,
+    UploadFile,
+)
+from fastapi.responses import StreamingResponse
+import csv
+from prisma.models import Talk, Utilisateur
+from app.api.deps import get_current_user, talk_fieldset
+from app.core.bulk import Format, TalkImporter, export_talks, iter_rows
+from app.core.config import settings
+from app.core.fieldsets import TalkFieldset
+from app.core.events import publish_planning, publish_talk_status
+from app.core.feedback import delete_talk_with_notes, feedback_buffer
+from app.core.http_cache import conditional_get
+from app.core.invalidation import notify
+from app.core.prisma import prisma, select_many, select_unique
+from app.core.schedule import find_conflicts
+from app.core.pagination import decode_cursor, encode_cursor, keyset_where
+from app.core.search import count_search, search_talk_ids
+from app.core.serialize import FastJSONResponse, talk_row
+from app.models.talk import (
+    ImportResult,
+    TalkCreate,
+    TalkOut,
+    TalkPage,
+    TalkUpdate,
+    StatutTalk,
+    Niveau,
+)
+from typing import Annotated, List, Literal, Optional, Union
+from datetime import datetime
 
 router = APIRouter()
 
 
 @router.get("/me", response_model=List[TalkOut])
-async def get_my_talks(current_user: Utilisateur = Depends(get_current_user)):
+async def get_my_talks(
+    request: Request,
+    response: Response,
+    fieldset: TalkFieldset = Depends(talk_fieldset),
+    current_user: Utilisateur = Depends(get_current_user),
+):
     """
     Récupère la liste des talks soumis par le conférencier connecté.
+    `fields` / `include` restreignent les champs et relations renvoyés.
     """
     # Vérifie que l'utilisateur est pas public
     if current_user.id_role == 3:
@@ -21,26 +59,48 @@ async def get_my_talks(current_user: Utilisateur = Depends(get_current_user)):
             detail="Pas d'accès public.",
         )
 
-    talks = await prisma.talk.find_many(
+    not_modified = conditional_get(
+        request, response, "talks", vary=str(current_user.id_utilisateur)
+    )
+    if not_modified:
+        return not_modified
+
+    talks = await select_many(
+        Talk,
+        fieldset.selection(),
         where={"id_conferencier": current_user.id_utilisateur},
-        include={"conferencier": True},
     )
 
-    return talks
+    return FastJSONResponse(
+        [fieldset.row(talk) for talk in talks], headers=dict(response.headers)
+    )
 
 
-@router.get("/", response_model=List[TalkOut])
+@router.get("/", response_model=Union[List[TalkOut], TalkPage])
 async def list_talks(
+    request: Request,
+    response: Response,
     statut: Optional[StatutTalk] = Query(None),
     niveau: Optional[Niveau] = Query(None),
     duree_min: Optional[int] = Query(None),
     duree_max: Optional[int] = Query(None),
     skip: int = 0,
     limit: int = 10,
+    pagination: Literal["offset", "cursor"] = Query("offset"),
+    cursor: Optional[str] = Query(None),
+    sort: Literal["id_talk", "titre", "duree"] = Query("id_talk"),
+    total: bool = Query(False),
+    fieldset: TalkFieldset = Depends(talk_fieldset),
     current_user: Utilisateur = Depends(get_current_user),
 ):
     """
     Liste paginée des talks avec filtres pour les organisateurs uniquement.
+    `fields=titre,statut` ne lit et ne renvoie que ces champs (sans relation),
+    `include=conferencier,planning` choisit les relations intégrées.
+    Avec `pagination=cursor` (ou un `cursor`), renvoie une page
+    `{items, next_cursor, total}` parcourue par clé (`sort`, id_talk)
+    plutôt que par décalage ; `total=true` ajoute le nombre de résultats
+    (en-tête `X-Total-Count` en pagination par décalage).
     """
     if current_user.id_role == 1 | current_user.id_role == 3:
         raise HTTPException(
@@ -48,6 +108,10 @@ async def list_talks(
             detail="Accès réservé aux organisateurs.",
         )
 
+    not_modified = conditional_get(request, response, "talks", "plannings")
+    if not_modified:
+        return not_modified
+
     filters = {}
 
     if statut:
@@ -62,45 +126,184 @@ async def list_talks(
             "lte": duree_max if duree_max is not None else 1000,
         }
 
+    if pagination == "cursor" or cursor:
+        page = await _list_talks_page(filters, cursor, sort, limit, total, fieldset)
+        return FastJSONResponse(page, headers=dict(response.headers))
+
+    talks = await select_many(
+        Talk, fieldset.selection(), where=filters, skip=skip, take=limit
+    )
+
+    if total:
+        response.headers["X-Total-Count"] = str(await prisma.talk.count(where=filters))
+
+    return FastJSONResponse(
+        [fieldset.row(talk) for talk in talks], headers=dict(response.headers)
+    )
+
+
+@router.get("/search", response_model=TalkPage)
+async def search_talks(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    statut: Optional[StatutTalk] = Query(None),
+    niveau: Optional[Niveau] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    total: bool = Query(False),
+    current_user: Utilisateur = Depends(get_current_user),
+):
+    """
+    Recherche plein texte dans le titre, le sujet et la description des talks.
+
+    Les résultats sont classés par pertinence (titre > sujet > description),
+    le dernier mot est cherché en préfixe, et `statut` / `niveau` restreignent
+    la recherche. Pagination par curseur via `next_cursor`. Réservée aux
+    organisateurs, comme la liste des talks.
+    """
+    if current_user.id_role in (1, 3):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Accès réservé aux organisateurs.",
+        )
+
+    not_modified = conditional_get(request, response, "talks", "plannings")
+    if not_modified:
+        return not_modified
+
+    after = decode_cursor(cursor, "rank") if cursor else None
+    facettes = (
+        statut.value if statut else None,
+        niveau.value if niveau else None,
+    )
+
+    # Une ligne de plus que demandé pour savoir s'il existe une page suivante
+    resultats = await search_talk_ids(q, *facettes, after=after, limit=limit + 1)
+    next_cursor = None
+    if len(resultats) > limit:
+        resultats = resultats[:limit]
+        last_id, last_rank = resultats[-1]
+        next_cursor = encode_cursor("rank", last_rank, last_id)
+
+    ids = [id_talk for id_talk, _ in resultats]
     talks = await prisma.talk.find_many(
-        where=filters,
-        skip=skip,
-        take=limit,
+        where={"id_talk": {"in": ids}},
         include={"conferencier": True, "planning": True},
     )
+    par_id = {talk.id_talk: talk for talk in talks}
+
+    return FastJSONResponse(
+        {
+            "items": [talk_row(par_id[i]) for i in ids if i in par_id],
+            "next_cursor": next_cursor,
+            "total": await count_search(q, *facettes) if total else None,
+        },
+        headers=dict(response.headers),
+    )
 
-    talks_out = []
-    for talk in talks:
-        date = talk.planning.date_heure.date() if talk.planning else None
-        heure = talk.planning.date_heure.time() if talk.planning else None
-
-        talks_out.append(
-            TalkOut(
-                id_talk=talk.id_talk,
-                titre=talk.titre,
-                sujet=talk.sujet,
-                description=talk.description,
-                duree=talk.duree,
-                niveau=talk.niveau,
-                statut=talk.statut,
-                id_conferencier=talk.id_conferencier,
-                conferencier=talk.conferencier,
-                date=date,
-                heure=heure,
-            )
+
+@router.get("/export")
+async def export_talks_file(
+    format: Format = Query("csv"),
+    current_user: Utilisateur = Depends(get_current_user),
+):
+    """
+    Exporte tous les talks en CSV ou NDJSON, envoyés en flux.
+    Accessible aux organisateurs et administrateurs.
+    """
+    if current_user.id_role not in (2, 4):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Accès réservé aux organisateurs.",
+        )
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        export_talks(format),
+        media_type=f"{media_type}; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="talks.{format}"'},
+    )
+
+
+@router.post("/import", response_model=ImportResult)
+async def import_talks(
+    file: UploadFile = File(...),
+    format: Optional[Format] = Query(None),
+    current_user: Utilisateur = Depends(get_current_user),
+):
+    """
+    Importe des talks depuis un fichier CSV (en-tête : titre, sujet,
+    description, duree, niveau, et optionnellement statut, id_conferencier)
+    ou NDJSON (un objet par ligne). Le format est déduit de l'extension si
+    `format` est absent. Les lignes valides sont insérées par lots, les
+    autres sont rapportées avec leur numéro de ligne.
+    """
+    if current_user.id_role not in (2, 4):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Accès réservé aux organisateurs.",
         )
+    if format is None:
+        nom = (file.filename or "").lower()
+        format = "ndjson" if nom.endswith((".ndjson", ".jsonl")) else "csv"
 
-    return talks_out
+    importer = TalkImporter(current_user.id_utilisateur, settings.IMPORT_BATCH_SIZE)
+    ligne = 0
+    try:
+        for ligne, row in iter_rows(file.file, format):
+            await importer.add(ligne, row)
+    except (UnicodeDecodeError, csv.Error) as exc:
+        # Lecture interrompue : les lignes déjà lues sont tout de même importées
+        importer.reject(ligne + 1, f"Fichier illisible : {exc}")
+    await importer.flush()
+    if importer.importes:
+        notify("talks")
+
+    return importer.result()
+
+
+async def _list_talks_page(
+    filters: dict,
+    cursor: Optional[str],
+    sort: str,
+    limit: int,
+    with_total: bool,
+    fieldset: TalkFieldset,
+) -> dict:
+    after = keyset_where(sort, "id_talk", cursor)
+    where = {"AND": [filters, after]} if after else filters
+    order = (
+        [{sort: "asc"}, {"id_talk": "asc"}] if sort != "id_talk" else {"id_talk": "asc"}
+    )
+
+    # Une ligne de plus que demandé pour savoir s'il existe une page suivante
+    talks = await select_many(
+        Talk, fieldset.selection(sort), where=where, take=limit + 1, order=order
+    )
+
+    next_cursor = None
+    if len(talks) > limit:
+        talks = talks[:limit]
+        last = talks[-1]
+        next_cursor = encode_cursor(sort, last[sort], last["id_talk"])
+
+    return {
+        "items": [fieldset.row(talk) for talk in talks],
+        "next_cursor": next_cursor,
+        "total": await prisma.talk.count(where=filters) if with_total else None,
+    }
 
 
 @router.get("/{talk_id}", response_model=TalkOut)
 async def get_talk_by_id(
     talk_id: int,
+    fieldset: TalkFieldset = Depends(talk_fieldset),
     current_user: Utilisateur = Depends(get_current_user),
 ):
     """
     Récupère un talk spécifique par son ID.
     Accessible uniquement aux organisateurs.
+    Réponse complète par défaut, réduite par `fields` / `include`.
     """
     if current_user.id_role == 1 or current_user.id_role == 3:
         raise HTTPException(
@@ -108,10 +311,7 @@ async def get_talk_by_id(
             detail="Accès réservé aux organisateurs.",
         )
 
-    talk = await prisma.talk.find_unique(
-        where={"id_talk": talk_id},
-        include={"conferencier": True, "planning": True},
-    )
+    talk = await select_unique(Talk, fieldset.selection(), {"id_talk": talk_id})
 
     if not talk:
         raise HTTPException(
@@ -119,22 +319,7 @@ async def get_talk_by_id(
             detail="Talk non trouvé.",
         )
 
-    date = talk.planning.date_heure.date() if talk.planning else None
-    heure = talk.planning.date_heure.time() if talk.planning else None
-
-    return TalkOut(
-        id_talk=talk.id_talk,
-        titre=talk.titre,
-        sujet=talk.sujet,
-        description=talk.description,
-        duree=talk.duree,
-        niveau=talk.niveau,
-        statut=talk.statut,
-        id_conferencier=talk.id_conferencier,
-        conferencier=talk.conferencier,
-        date=date,
-        heure=heure,
-    )
+    return FastJSONResponse(fieldset.row(talk))
 
 
 @router.post("/", response_model=TalkOut, status_code=status.HTTP_201_CREATED)
@@ -164,6 +349,7 @@ async def create_talk(
             "id_conferencier": current_user.id_utilisateur,
         }
     )
+    notify("talks")
     return new_talk
 
 
@@ -205,6 +391,7 @@ async def update_talk(
         },
         include={"conferencier": True},
     )
+    notify("talks")
 
     return updated_talk
 
@@ -248,6 +435,8 @@ async def update_talk_status(
         data={"statut": statut_recu},
         include={"conferencier": True},
     )
+    notify("talks")
+    publish_talk_status(id, statut_recu)
 
     return updated_talk
 
@@ -286,19 +475,9 @@ async def schedule_talk(
     except ValueError:
         raise HTTPException(status_code=400, detail="Format de date ou heure invalide")
 
-    # Vérifie les conflits de planning
-    conflict = await prisma.planning.find_first(
-        where={
-            "id_salle": id_salle,
-            "date_heure": {
-                "gte": datetime.combine(date_heure.date(), datetime.min.time()),
-                "lt": datetime.combine(date_heure.date(), datetime.min.time())
-                + timedelta(days=1),
-            },
-            "id_talk": {"not": id},
-        }
-    )
-    if conflict:
+    # Vérifie les conflits de planning : chevauchement avec [début, début + durée)
+    conflicts = await find_conflicts(id_salle, date_heure, talk.duree, ignore_talk=id)
+    if conflicts:
         raise HTTPException(
             status_code=400, detail="La salle est déjà réservée pour ce créneau."
         )
@@ -313,7 +492,7 @@ async def schedule_talk(
     existing_planning = await prisma.planning.find_unique(where={"id_talk": id})
 
     if existing_planning:
-        await prisma.planning.update(
+        planning = await prisma.planning.update(
             where={"id_talk": id},
             data={
                 "id_salle": id_salle,
@@ -321,7 +500,7 @@ async def schedule_talk(
             },
         )
     else:
-        await prisma.planning.create(
+        planning = await prisma.planning.create(
             data={
                 "id_talk": id,
                 "id_salle": id_salle,
@@ -329,6 +508,12 @@ async def schedule_talk(
                 "id_organisateur": current_user.id_utilisateur,
             }
         )
+    notify("talks", "plannings")
+    if talk.statut != "PLANIFIE":
+        publish_talk_status(id, "PLANIFIE")
+    publish_planning(
+        "planning.moved" if existing_planning else "planning.created", planning
+    )
 
     # Recharge avec conferencier + planning
     full_talk = await prisma.talk.find_unique(
@@ -360,6 +545,8 @@ async def delete_talk(
     - l'utilisateur est conférencier propriétaire du talk,
     - ou administrateur,
     - et que le talk n'est pas planifié.
+    Ses favoris, feedbacks et notes sont supprimés avec lui, et ses notes
+    retirées de l'agrégat du conférencier.
     """
     talk = await prisma.talk.find_unique(where={"id_talk": id})
 
@@ -378,5 +565,8 @@ async def delete_talk(
             detail="Le talk est déjà planifié et ne peut pas être supprimé",
         )
 
-    await prisma.talk.delete(where={"id_talk": id})
+    # Un feedback reçu ensuite est ignoré à l'écriture du lot (jointure Talk)
+    feedback_buffer.discard_talk(id)
+    await delete_talk_with_notes(id)
+    notify("talks", "favoris", "feedbacks")
     return None  # 204 No Content
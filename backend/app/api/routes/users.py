@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException, status
 from app.models.utilisateur import UtilisateurCreate, UtilisateurOut
 from app.core.prisma import prisma
+from app.core.principal import invalidate_user
 
 router = APIRouter()
 
@@ -19,6 +20,7 @@ async def creer_utilisateur(utilisateur: UtilisateurCreate):
             "id_role": utilisateur.id_role,
         }
     )
+    invalidate_user(new_user.id_utilisateur)
     return new_user
 
 
@@ -0,0 +1,157 @@
+import csv
+import io
+import json
+from enum import Enum
+from typing import AsyncIterator, BinaryIO, Iterator, Literal
+from pydantic import ValidationError
+from app.core.config import settings
+from app.core.prisma import prisma
+from app.models.talk import ImportErreur, ImportResult, TalkImport
+
+Format = Literal["csv", "ndjson"]
+
+EXPORT_FIELDS = (
+    "id_talk",
+    "titre",
+    "sujet",
+    "description",
+    "duree",
+    "niveau",
+    "statut",
+    "id_conferencier",
+)
+
+
+def iter_rows(file: BinaryIO, fmt: Format) -> Iterator[tuple[int, object]]:
+    """
+    Lit le fichier ligne à ligne et produit (numéro de ligne, dictionnaire),
+    ou (numéro de ligne, message) pour une ligne illisible.
+    """
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for row in reader:
+            # Colonnes vides : valeur par défaut du modèle
+            yield reader.line_num, {k: v for k, v in row.items() if k and v != ""}
+        return
+    for numero, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield numero, f"JSON invalide : {exc.msg}"
+            continue
+        if not isinstance(row, dict):
+            yield numero, "Objet JSON attendu."
+            continue
+        yield numero, row
+
+
+def _message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in exc.errors()
+    )
+
+
+class TalkImporter:
+    """
+    Valide les lignes avec `TalkImport` et les insère par lots `create_many`.
+    Les lignes rejetées sont comptées, et détaillées jusqu'à
+    IMPORT_MAX_ERRORS erreurs.
+    """
+
+    def __init__(self, id_importateur: int, batch_size: int):
+        self.id_importateur = id_importateur
+        self.batch_size = batch_size
+        self._lot: list[tuple[int, dict]] = []
+        self.importes = 0
+        self.rejetes = 0
+        self.erreurs: list[ImportErreur] = []
+
+    def reject(self, ligne: int, erreur: str) -> None:
+        self.rejetes += 1
+        if len(self.erreurs) < settings.IMPORT_MAX_ERRORS:
+            self.erreurs.append(ImportErreur(ligne=ligne, erreur=erreur))
+
+    async def add(self, ligne: int, row: object) -> None:
+        if isinstance(row, str):
+            self.reject(ligne, row)
+            return
+        try:
+            talk = TalkImport.model_validate(row)
+        except ValidationError as exc:
+            self.reject(ligne, _message(exc))
+            return
+        data = talk.model_dump(mode="json")
+        data["id_conferencier"] = talk.id_conferencier or self.id_importateur
+        self._lot.append((ligne, data))
+        if len(self._lot) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        if not self._lot:
+            return
+        lot, self._lot = self._lot, []
+
+        # Conférenciers inconnus : rejet de la ligne plutôt que du lot entier
+        ids = {data["id_conferencier"] for _, data in lot}
+        connus = {
+            u.id_utilisateur
+            for u in await prisma.utilisateur.find_many(
+                where={"id_utilisateur": {"in": list(ids)}}
+            )
+        }
+        valides = []
+        for ligne, data in lot:
+            if data["id_conferencier"] in connus:
+                valides.append(data)
+            else:
+                self.reject(ligne, "id_conferencier: utilisateur inconnu")
+
+        if valides:
+            self.importes += await prisma.talk.create_many(data=valides)
+
+    def result(self) -> ImportResult:
+        return ImportResult(
+            importes=self.importes, rejetes=self.rejetes, erreurs=self.erreurs
+        )
+
+
+def _valeur(value):
+    return value.value if isinstance(value, Enum) else value
+
+
+async def export_talks(fmt: Format) -> AsyncIterator[bytes]:
+    """
+    Parcourt les talks par blocs ordonnés sur id_talk : la mémoire reste
+    constante quel que soit le nombre de talks.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if fmt == "csv":
+        writer.writerow(EXPORT_FIELDS)
+
+    dernier = 0
+    while True:
+        talks = await prisma.talk.find_many(
+            where={"id_talk": {"gt": dernier}},
+            order={"id_talk": "asc"},
+            take=settings.EXPORT_BATCH_SIZE,
+        )
+        for talk in talks:
+            valeurs = [_valeur(getattr(talk, champ)) for champ in EXPORT_FIELDS]
+            if fmt == "csv":
+                writer.writerow(valeurs)
+            else:
+                buffer.write(
+                    json.dumps(dict(zip(EXPORT_FIELDS, valeurs)), ensure_ascii=False)
+                )
+                buffer.write("\n")
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+        if len(talks) < settings.EXPORT_BATCH_SIZE:
+            break
+        dernier = talks[-1].id_talk
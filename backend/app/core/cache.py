@@ -0,0 +1,77 @@
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+from app.core.invalidation import subscribe, version
+
+
+class TTLCache:
+    """
+    Cache en mémoire borné (LRU) dont les entrées expirent après `ttl` secondes.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def discard_if(self, predicate: Callable[[Any], bool]) -> None:
+        # Supprime toutes les entrées dont la valeur vérifie le prédicat
+        for key in [k for k, (_, v) in self._data.items() if predicate(v)]:
+            del self._data[key]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class ReadThroughCache:
+    """
+    Réponses déjà sérialisées (bytes JSON), rechargées à l'expiration du TTL
+    ou dès qu'un des sujets est invalidé (voir `app.core.invalidation`).
+    """
+
+    def __init__(self, ttl: float, topics: tuple[str, ...] = (), maxsize: int = 64):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._topics = topics
+        for topic in topics:
+            subscribe(topic, self._cache.clear)
+
+    def _versions(self) -> tuple[int, ...]:
+        return tuple(version(topic) for topic in self._topics)
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[bytes]]) -> bytes:
+        body = self._cache.get(key)
+        if body is None:
+            versions = self._versions()
+            body = await loader()
+            # Écriture pendant le chargement : le résultat est peut-être
+            # antérieur à l'invalidation, il n'est pas gardé
+            if self._versions() == versions:
+                self._cache.set(key, body)
+        return body
+
+    def clear(self) -> None:
+        self._cache.clear()
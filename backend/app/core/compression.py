@@ -0,0 +1,107 @@
+import gzip
+import zlib
+from typing import Optional
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # dépendance facultative : gzip seulement
+    brotli = None
+
+# Par ordre de préférence à poids égal
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Encodage à utiliser d'après l'en-tête Accept-Encoding (poids `q` compris),
+    ou None si le client n'en accepte aucun.
+    """
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in ENCODINGS:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    # mtime fixe : même entrée, mêmes octets
+    return gzip.compress(data, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+class StreamCompressor:
+    """
+    Compression au fil de l'eau d'une réponse en plusieurs morceaux.
+    """
+
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._brotli = brotli.Compressor(
+                quality=settings.COMPRESSION_BROTLI_QUALITY
+            )
+        else:
+            self._brotli = None
+            # wbits 31 : en-tête et somme de contrôle gzip
+            self._zlib = zlib.compressobj(
+                settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31
+            )
+
+    def compress(self, data: bytes) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.process(data)
+        return self._zlib.compress(data)
+
+    def finish(self) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+class CompressedCache:
+    """
+    Corps compressés des réponses qui portent un ETag. L'ETag change à chaque
+    écriture sur les sujets dont dépend la réponse (voir `app.core.http_cache`),
+    donc chaque version n'est compressée qu'une fois par encodage.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def get(self, etag: Optional[str], encoding: str, body: bytes) -> bytes:
+        if not etag:
+            return compress(body, encoding)
+        # La taille protège d'un ETag réutilisé pour un autre contenu
+        key = (etag, encoding, len(body))
+        data = self._cache.get(key)
+        if data is None:
+            data = compress(body, encoding)
+            self._cache.set(key, data)
+        return data
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+compressed_cache = CompressedCache(
+    settings.COMPRESSION_CACHE_MAXSIZE, settings.COMPRESSION_CACHE_TTL
+)
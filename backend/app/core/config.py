@@ -11,5 +11,118 @@ class Settings:
     SECRET_KEY: str = os.getenv("SECRET_KEY")
     WEBSITE_URL: str = os.getenv("WEBSITE_URL")
 
+    # Authentification : lecture en base à chaque requête (mode strict)
+    # ou résolution via cache et claims du token
+    AUTH_STRICT_DB_CHECK: bool = (
+        os.getenv("AUTH_STRICT_DB_CHECK", "false").lower() == "true"
+    )
+    AUTH_TRUST_TOKEN_CLAIMS: bool = (
+        os.getenv("AUTH_TRUST_TOKEN_CLAIMS", "true").lower() == "true"
+    )
+    USER_CACHE_TTL: float = float(os.getenv("USER_CACHE_TTL", "60"))
+    USER_CACHE_MAXSIZE: int = int(os.getenv("USER_CACHE_MAXSIZE", "2048"))
+
+    # Pool de connexions du client Prisma partagé
+    DB_POOL_SIZE: int = int(
+        os.getenv("DB_POOL_SIZE", str((os.cpu_count() or 1) * 2 + 1))
+    )
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "10"))
+    DB_CONNECT_TIMEOUT: int = int(os.getenv("DB_CONNECT_TIMEOUT", "10"))
+
+    # Hashage bcrypt hors de la boucle d'événements
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    HASH_EXECUTOR: str = os.getenv("HASH_EXECUTOR", "thread")  # thread | process
+    HASH_WORKERS: int = int(os.getenv("HASH_WORKERS", str(os.cpu_count() or 1)))
+    HASH_MAX_PENDING: int = int(os.getenv("HASH_MAX_PENDING", "64"))
+    HASH_RETRY_AFTER: int = int(os.getenv("HASH_RETRY_AFTER", "2"))
+
+    # Durée de vie du cache des statistiques du tableau de bord (secondes)
+    STATS_CACHE_TTL: float = float(os.getenv("STATS_CACHE_TTL", "30"))
+
+    # Cache des données de référence (salles, rôles) et propagation
+    # des invalidations entre workers : local | file
+    REFERENCE_CACHE_TTL: float = float(os.getenv("REFERENCE_CACHE_TTL", "300"))
+    INVALIDATION_BACKEND: str = os.getenv("INVALIDATION_BACKEND", "local")
+    INVALIDATION_DIR: str = os.getenv(
+        "INVALIDATION_DIR", "/tmp/talkmaster-invalidation"
+    )
+    INVALIDATION_POLL_INTERVAL: float = float(
+        os.getenv("INVALIDATION_POLL_INTERVAL", "0.5")
+    )
+
+    # Planification : journée ouvrée et durée maximale d'un talk (minutes)
+    SCHEDULE_DAY_START: str = os.getenv("SCHEDULE_DAY_START", "08:00")
+    SCHEDULE_DAY_END: str = os.getenv("SCHEDULE_DAY_END", "20:00")
+    SCHEDULE_MAX_TALK_DUREE: int = int(os.getenv("SCHEDULE_MAX_TALK_DUREE", "480"))
+
+    # Taille des blocs lus en base pour les plannings renvoyés en flux
+    PLANNING_STREAM_CHUNK: int = int(os.getenv("PLANNING_STREAM_CHUNK", "500"))
+
+    # Flux d'événements du planning (SSE) : tampon de reprise, file par client,
+    # intervalle des messages de maintien et délai de reconnexion conseillé
+    EVENTS_HISTORY: int = int(os.getenv("EVENTS_HISTORY", "1000"))
+    EVENTS_CLIENT_QUEUE: int = int(os.getenv("EVENTS_CLIENT_QUEUE", "100"))
+    EVENTS_HEARTBEAT: float = float(os.getenv("EVENTS_HEARTBEAT", "15"))
+    EVENTS_RETRY_MS: int = int(os.getenv("EVENTS_RETRY_MS", "3000"))
+
+    # Feedbacks écrits par lots : taille d'un lot, délai maximal avant écriture,
+    # nombre maximal en attente (au-delà : 503 avec Retry-After)
+    FEEDBACK_BATCH_SIZE: int = int(os.getenv("FEEDBACK_BATCH_SIZE", "500"))
+    FEEDBACK_FLUSH_INTERVAL: float = float(os.getenv("FEEDBACK_FLUSH_INTERVAL", "1"))
+    FEEDBACK_MAX_PENDING: int = int(os.getenv("FEEDBACK_MAX_PENDING", "50000"))
+    FEEDBACK_RETRY_AFTER: int = int(os.getenv("FEEDBACK_RETRY_AFTER", "2"))
+
+    # Import / export de talks en masse
+    IMPORT_BATCH_SIZE: int = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+    IMPORT_MAX_ERRORS: int = int(os.getenv("IMPORT_MAX_ERRORS", "1000"))
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+    # Flux iCalendar rendus une fois et gardés en bytes jusqu'à la prochaine
+    # écriture sur le planning (le TTL n'est qu'un filet de sécurité)
+    ICS_CACHE_TTL: float = float(os.getenv("ICS_CACHE_TTL", "3600"))
+    ICS_CACHE_MAXSIZE: int = int(os.getenv("ICS_CACHE_MAXSIZE", "1024"))
+
+    # Métriques exposées sur /metrics, et période de mesure du retard
+    # de la boucle d'événements (secondes)
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    LOOP_LAG_INTERVAL: float = float(os.getenv("LOOP_LAG_INTERVAL", "0.5"))
+
+    # Alertes de développement sur les requêtes Prisma : requête lente (ms),
+    # trop de requêtes pour une requête HTTP, même requête répétée (N+1)
+    QUERY_WARNINGS: bool = os.getenv("QUERY_WARNINGS", "false").lower() == "true"
+    QUERY_SLOW_MS: float = float(os.getenv("QUERY_SLOW_MS", "100"))
+    QUERY_MAX_PER_REQUEST: int = int(os.getenv("QUERY_MAX_PER_REQUEST", "10"))
+    QUERY_REPEAT_THRESHOLD: int = int(os.getenv("QUERY_REPEAT_THRESHOLD", "3"))
+
+    # Serveur de production (python -m app.server) : un worker par cœur,
+    # file d'attente des connexions, keep-alive (s), délai accordé aux
+    # requêtes en cours à l'arrêt (s) et recyclage des workers après
+    # WORKER_MAX_REQUESTS requêtes (0 : jamais)
+    HOST: str = os.getenv("HOST", "0.0.0.0")
+    PORT: int = int(os.getenv("PORT", "8000"))
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 1)))
+    SERVER_BACKLOG: int = int(os.getenv("SERVER_BACKLOG", "2048"))
+    KEEPALIVE_TIMEOUT: int = int(os.getenv("KEEPALIVE_TIMEOUT", "5"))
+    GRACEFUL_TIMEOUT: int = int(os.getenv("GRACEFUL_TIMEOUT", "20"))
+    WORKER_MAX_REQUESTS: int = int(os.getenv("WORKER_MAX_REQUESTS", "0"))
+    READY_TIMEOUT: float = float(os.getenv("READY_TIMEOUT", "2"))
+    ACCESS_LOG: bool = os.getenv("ACCESS_LOG", "false").lower() == "true"
+
+    # Compression des réponses (gzip, et brotli s'il est installé) au-delà de
+    # COMPRESSION_MIN_SIZE octets, pour les seuls types listés. Les corps
+    # compressés des réponses avec ETag sont gardés en cache.
+    COMPRESSION_ENABLED: bool = (
+        os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    )
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    COMPRESSION_TYPES: list[str] = os.getenv(
+        "COMPRESSION_TYPES",
+        "application/json,application/x-ndjson,text/csv,text/calendar,text/plain",
+    ).split(",")
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+    COMPRESSION_CACHE_MAXSIZE: int = int(os.getenv("COMPRESSION_CACHE_MAXSIZE", "256"))
+    COMPRESSION_CACHE_TTL: float = float(os.getenv("COMPRESSION_CACHE_TTL", "3600"))
+
 
 settings = Settings()
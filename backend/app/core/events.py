@@ -0,0 +1,136 @@
+import asyncio
+import json
+import uuid
+from collections import deque
+from typing import AsyncIterator, Optional
+from app.core.config import settings
+from app.core.invalidation import on_remote
+
+# Identifiant de ce processus : un identifiant d'événement émis par un autre
+# processus (ou avant un redémarrage) ne peut pas servir à reprendre le flux.
+_BOOT_ID = uuid.uuid4().hex[:12]
+
+
+class _Client:
+    def __init__(self, maxsize: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.overflow = False
+
+
+class EventBroker:
+    """
+    Diffuse les changements du planning aux clients connectés.
+
+    Les derniers événements sont conservés dans un tampon circulaire pour
+    permettre la reprise après `Last-Event-ID`. Chaque client a sa propre file
+    bornée : un client trop lent est déconnecté avec un événement `resync`
+    plutôt que de ralentir les écritures ou de faire grossir la mémoire.
+    """
+
+    def __init__(self, history: int, client_queue: int):
+        self._seq = 0
+        self._history: deque[tuple[int, bytes]] = deque(maxlen=history)
+        self._clients: set[_Client] = set()
+        self._client_queue = client_queue
+
+    def publish(self, event: str, data: dict) -> None:
+        self._seq += 1
+        message = _format(f"{_BOOT_ID}-{self._seq}", event, data)
+        self._history.append((self._seq, message))
+        for client in list(self._clients):
+            try:
+                client.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                client.overflow = True
+                self._clients.discard(client)
+
+    def _replay(self, last_event_id: Optional[str]) -> Optional[list[bytes]]:
+        """
+        Événements postérieurs à `last_event_id`, ou None si la reprise est
+        impossible (autre processus, ou événements sortis du tampon).
+        """
+        if not last_event_id:
+            return []
+        boot, _, seq = last_event_id.rpartition("-")
+        if boot != _BOOT_ID or not seq.isdigit():
+            return None
+        seq = int(seq)
+        if seq > self._seq:
+            return None
+        if seq < self._seq and self._history[0][0] > seq + 1:
+            return None
+        return [message for s, message in self._history if s > seq]
+
+    async def stream(
+        self, last_event_id: Optional[str], heartbeat: float
+    ) -> AsyncIterator[bytes]:
+        client = _Client(self._client_queue)
+        # Inscription et relecture sans point d'attente entre les deux :
+        # aucun événement ne peut être perdu ni dupliqué.
+        self._clients.add(client)
+        replay = self._replay(last_event_id)
+        try:
+            yield f"retry: {int(settings.EVENTS_RETRY_MS)}\n\n".encode()
+            if replay is None:
+                yield _format(None, "resync", {})
+            else:
+                for message in replay:
+                    yield message
+            while not client.overflow:
+                try:
+                    message = await asyncio.wait_for(client.queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield b": ping\n\n"
+                    continue
+                yield message
+            # File saturée : le client se reconnecte et recharge le planning
+            yield _format(None, "resync", {})
+        finally:
+            self._clients.discard(client)
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+
+def _format(event_id: Optional[str], event: str, data: dict) -> bytes:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append("data: " + json.dumps(data, separators=(",", ":"), default=str))
+    return ("\n".join(lines) + "\n\n").encode()
+
+
+broker = EventBroker(settings.EVENTS_HISTORY, settings.EVENTS_CLIENT_QUEUE)
+
+
+def publish_planning(event: str, planning) -> None:
+    """
+    `planning.created` ou `planning.moved`, avec les seuls champs utiles
+    pour mettre à jour une vue du planning. Date et heure sans fuseau, comme
+    dans les listes (`planning_row`) : ce sont des heures locales.
+    """
+    iso = planning.date_heure.isoformat()
+    broker.publish(
+        event,
+        {
+            "id_planning": planning.id_planning,
+            "id_talk": planning.id_talk,
+            "id_salle": planning.id_salle,
+            "date": iso[:10],
+            "heure": iso[11:16],
+        },
+    )
+
+
+def publish_talk_status(id_talk: int, statut: str) -> None:
+    broker.publish("talk.status", {"id_talk": id_talk, "statut": statut})
+
+
+def _on_remote(topics: list[str]) -> None:
+    # Écriture faite par un autre worker : son détail n'est pas connu ici
+    if "plannings" in topics or "talks" in topics:
+        broker.publish("resync", {})
+
+
+on_remote(_on_remote)
@@ -0,0 +1,250 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+from fastapi import HTTPException, status
+from app.core.config import settings
+from app.core.invalidation import notify
+from app.core.prisma import prisma
+
+logger = logging.getLogger(__name__)
+
+# Verrous transactionnels des talks d'un lot, pris dans l'ordre du tableau
+# (trié) : les écritures concurrentes sur un même talk, venues d'un autre
+# worker ou d'une suppression, attendent la fin de la transaction.
+LOCK_TALKS_SQL = """
+SELECT count(*) AS verrous
+FROM unnest($1::int[]) AS t(id_talk),
+     LATERAL pg_advisory_xact_lock(hashtext('feedback'), t.id_talk)
+"""
+
+# Écrit un lot de feedbacks et met à jour les agrégats en une seule requête,
+# après LOCK_TALKS_SQL dans la même transaction. `ancien` lit les notes
+# remplacées avant l'écriture : les agrégats reçoivent +1 pour chaque note
+# écrite et -1 pour chaque note remplacée, ce qui les garde exacts quand un
+# utilisateur modifie sa note. Sans le verrou, une note écrite par une autre
+# transaction après l'instantané de la requête serait écrasée sans être
+# retirée des agrégats.
+FLUSH_FEEDBACKS_SQL = """
+WITH donnees AS (
+    SELECT d.*
+    FROM unnest($1::int[], $2::int[], $3::int[], $4::text[], $5::timestamp[])
+        AS d(id_utilisateur, id_talk, note, commentaire, date_feedback)
+    JOIN "Talk" t ON t.id_talk = d.id_talk
+),
+ancien AS (
+    SELECT f.id_talk, f.note
+    FROM "Feedback" f
+    JOIN donnees d
+      ON d.id_utilisateur = f.id_utilisateur AND d.id_talk = f.id_talk
+),
+ecrit AS (
+    INSERT INTO "Feedback" (id_utilisateur, id_talk, note, commentaire, date_feedback)
+    SELECT id_utilisateur, id_talk, note, commentaire, date_feedback FROM donnees
+    ON CONFLICT (id_utilisateur, id_talk) DO UPDATE
+    SET note = EXCLUDED.note,
+        commentaire = EXCLUDED.commentaire,
+        date_feedback = EXCLUDED.date_feedback
+    RETURNING id_talk, note
+),
+delta AS (
+    SELECT id_talk, 1 AS n, note FROM ecrit
+    UNION ALL
+    SELECT id_talk, -1 AS n, note FROM ancien
+),
+par_talk AS (
+    SELECT d.id_talk, t.id_conferencier,
+           sum(d.n) AS nb, sum(d.n * d.note) AS somme,
+           coalesce(sum(d.n) FILTER (WHERE d.note = 1), 0) AS note_1,
+           coalesce(sum(d.n) FILTER (WHERE d.note = 2), 0) AS note_2,
+           coalesce(sum(d.n) FILTER (WHERE d.note = 3), 0) AS note_3,
+           coalesce(sum(d.n) FILTER (WHERE d.note = 4), 0) AS note_4,
+           coalesce(sum(d.n) FILTER (WHERE d.note = 5), 0) AS note_5
+    FROM delta d
+    JOIN "Talk" t ON t.id_talk = d.id_talk
+    GROUP BY d.id_talk, t.id_conferencier
+),
+maj_talk AS (
+    INSERT INTO "NoteTalk" AS a
+        (id_talk, nb, somme, note_1, note_2, note_3, note_4, note_5)
+    SELECT id_talk, nb, somme, note_1, note_2, note_3, note_4, note_5
+    FROM par_talk
+    ON CONFLICT (id_talk) DO UPDATE
+    SET nb = a.nb + EXCLUDED.nb,
+        somme = a.somme + EXCLUDED.somme,
+        note_1 = a.note_1 + EXCLUDED.note_1,
+        note_2 = a.note_2 + EXCLUDED.note_2,
+        note_3 = a.note_3 + EXCLUDED.note_3,
+        note_4 = a.note_4 + EXCLUDED.note_4,
+        note_5 = a.note_5 + EXCLUDED.note_5
+)
+INSERT INTO "NoteConferencier" AS a
+    (id_conferencier, nb, somme, note_1, note_2, note_3, note_4, note_5)
+SELECT id_conferencier, sum(nb), sum(somme),
+       sum(note_1), sum(note_2), sum(note_3), sum(note_4), sum(note_5)
+FROM par_talk
+GROUP BY id_conferencier
+ON CONFLICT (id_conferencier) DO UPDATE
+SET nb = a.nb + EXCLUDED.nb,
+    somme = a.somme + EXCLUDED.somme,
+    note_1 = a.note_1 + EXCLUDED.note_1,
+    note_2 = a.note_2 + EXCLUDED.note_2,
+    note_3 = a.note_3 + EXCLUDED.note_3,
+    note_4 = a.note_4 + EXCLUDED.note_4,
+    note_5 = a.note_5 + EXCLUDED.note_5
+"""
+
+# Supprime un talk et retire ses notes de l'agrégat de son conférencier,
+# après LOCK_TALKS_SQL (voir `delete_talk_with_notes`). Feedback, NoteTalk
+# et Favori suivent par ON DELETE CASCADE ; NoteTalk est supprimé
+# explicitement pour relire ses compteurs.
+DELETE_TALK_SQL = """
+WITH note AS (
+    DELETE FROM "NoteTalk" WHERE id_talk = $1
+    RETURNING nb, somme, note_1, note_2, note_3, note_4, note_5
+),
+talk AS (
+    DELETE FROM "Talk" WHERE id_talk = $1
+    RETURNING id_conferencier
+)
+UPDATE "NoteConferencier" AS a
+SET nb = a.nb - n.nb,
+    somme = a.somme - n.somme,
+    note_1 = a.note_1 - n.note_1,
+    note_2 = a.note_2 - n.note_2,
+    note_3 = a.note_3 - n.note_3,
+    note_4 = a.note_4 - n.note_4,
+    note_5 = a.note_5 - n.note_5
+FROM note n, talk t
+WHERE a.id_conferencier = t.id_conferencier
+"""
+
+
+async def delete_talk_with_notes(id_talk: int) -> None:
+    """
+    Supprime un talk et ses notes, sans course avec l'écriture d'un lot.
+    """
+    async with prisma.tx() as transaction:
+        await transaction.query_raw(LOCK_TALKS_SQL, [id_talk])
+        await transaction.execute_raw(DELETE_TALK_SQL, id_talk)
+
+
+@dataclass(frozen=True)
+class FeedbackEnAttente:
+    id_utilisateur: int
+    id_talk: int
+    note: int
+    commentaire: str
+    date_feedback: datetime
+
+
+class FeedbackBuffer:
+    """
+    Tampon des feedbacks reçus, écrits en base par lots.
+
+    Un seul feedback par (utilisateur, talk) est gardé : un nouvel envoi
+    remplace le précédent tant que le lot n'est pas parti. Le lot est écrit
+    dès `batch_size` feedbacks, sinon toutes les `interval` secondes. Au-delà
+    de `max_pending` feedbacks en attente, les envois reçoivent 503.
+    """
+
+    def __init__(self, batch_size: int, interval: float, max_pending: int):
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_pending = max_pending
+        self._pending: dict[tuple[int, int], FeedbackEnAttente] = {}
+        self._full = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def submit(self, feedback: FeedbackEnAttente) -> None:
+        key = (feedback.id_utilisateur, feedback.id_talk)
+        if key not in self._pending and len(self._pending) >= self.max_pending:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Serveur surchargé, veuillez réessayer.",
+                headers={"Retry-After": str(settings.FEEDBACK_RETRY_AFTER)},
+            )
+        self._pending[key] = feedback
+        if len(self._pending) >= self.batch_size:
+            self._full.set()
+
+    def discard_talk(self, id_talk: int) -> int:
+        """
+        Retire les feedbacks en attente d'un talk supprimé.
+        """
+        keys = [key for key in self._pending if key[1] == id_talk]
+        for key in keys:
+            del self._pending[key]
+        return len(keys)
+
+    async def flush(self) -> int:
+        """
+        Écrit tous les feedbacks en attente, par lots de `batch_size`.
+        """
+        ecrits = 0
+        while self._pending:
+            keys = list(self._pending)[: self.batch_size]
+            lot = [self._pending.pop(key) for key in keys]
+            try:
+                async with prisma.tx() as transaction:
+                    await transaction.query_raw(
+                        LOCK_TALKS_SQL, sorted({f.id_talk for f in lot})
+                    )
+                    await transaction.execute_raw(
+                        FLUSH_FEEDBACKS_SQL,
+                        [f.id_utilisateur for f in lot],
+                        [f.id_talk for f in lot],
+                        [f.note for f in lot],
+                        [f.commentaire for f in lot],
+                        [f.date_feedback.isoformat() for f in lot],
+                    )
+            except BaseException:
+                # Remis en attente (y compris à l'annulation de la tâche)
+                # sauf s'ils ont été remplacés entre-temps
+                for f in lot:
+                    self._pending.setdefault((f.id_utilisateur, f.id_talk), f)
+                raise
+            ecrits += len(lot)
+        if ecrits:
+            notify("feedbacks")
+        return ecrits
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._full.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._full.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Échec de l'écriture des feedbacks, nouvel essai")
+                await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("Feedbacks perdus à l'arrêt : %d", len(self._pending))
+
+
+feedback_buffer = FeedbackBuffer(
+    settings.FEEDBACK_BATCH_SIZE,
+    settings.FEEDBACK_FLUSH_INTERVAL,
+    settings.FEEDBACK_MAX_PENDING,
+)
@@ -0,0 +1,100 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+from fastapi import HTTPException, status
+
+# Champs de TalkOut ; `date` et `heure` viennent du planning du talk
+TALK_FIELDS = (
+    "id_talk",
+    "titre",
+    "sujet",
+    "description",
+    "duree",
+    "niveau",
+    "statut",
+    "id_conferencier",
+    "date",
+    "heure",
+)
+_PLANNING_FIELDS = {"date", "heure"}
+
+# Relations intégrables, avec les seuls champs lus en base (jamais le mot
+# de passe du conférencier)
+TALK_RELATIONS = {
+    "conferencier": "conferencier { id_utilisateur nom email id_role }",
+    "planning": "planning { id_planning id_salle date_heure }",
+}
+DEFAULT_INCLUDE = ("conferencier",)
+
+
+def _parse_names(value: str, allowed, label: str) -> tuple[str, ...]:
+    names = tuple(dict.fromkeys(n.strip() for n in value.split(",") if n.strip()))
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{label} inconnu(s) : {', '.join(unknown)}.",
+        )
+    return names
+
+
+@dataclass(frozen=True)
+class TalkFieldset:
+    """
+    Projection d'un talk demandée par `fields=` et `include=` : détermine
+    à la fois la sélection envoyée au moteur Prisma et la forme de la réponse.
+    """
+
+    fields: tuple[str, ...] = TALK_FIELDS
+    include: tuple[str, ...] = DEFAULT_INCLUDE
+
+    def selection(self, *extra: str) -> list[str]:
+        """
+        Champs à lire en base ; `extra` ajoute des champs utiles au
+        traitement (clé de tri) sans les renvoyer.
+        """
+        scalars = [name for name in self.fields if name not in _PLANNING_FIELDS]
+        for name in ("id_talk", *extra):
+            if name not in scalars:
+                scalars.append(name)
+        selection = scalars + [TALK_RELATIONS[name] for name in self.include]
+        if (
+            _PLANNING_FIELDS.intersection(self.fields)
+            and "planning" not in self.include
+        ):
+            selection.append("planning { date_heure }")
+        return selection
+
+    def row(self, raw: dict) -> dict:
+        """
+        Réponse à partir d'une ligne brute du moteur (dates en ISO 8601).
+        """
+        planning = raw.get("planning")
+        debut = datetime.fromisoformat(planning["date_heure"]) if planning else None
+        row = {}
+        for name in self.fields:
+            if name == "date":
+                row[name] = debut.date().isoformat() if debut else None
+            elif name == "heure":
+                row[name] = debut.time().isoformat() if debut else None
+            else:
+                row[name] = raw[name]
+        for name in self.include:
+            row[name] = raw.get(name)
+        return row
+
+
+def parse_talk_fieldset(fields: Optional[str], include: Optional[str]) -> TalkFieldset:
+    """
+    Sans paramètre : réponse complète, conférencier compris. Avec `fields`
+    seul : ces champs et aucune relation ; `include=` (même vide) choisit les
+    relations.
+    """
+    if include is not None:
+        relations = _parse_names(include, TALK_RELATIONS, "Relation")
+    else:
+        relations = DEFAULT_INCLUDE if fields is None else ()
+    return TalkFieldset(
+        fields=_parse_names(fields, TALK_FIELDS, "Champ") if fields else TALK_FIELDS,
+        include=relations,
+    )
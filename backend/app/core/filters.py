@@ -0,0 +1,62 @@
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+
+class WhereBuilder:
+    """
+    Construit une clause `where` Prisma en combinant les conditions par AND.
+
+    Chaque condition reste une clause distincte : deux filtres sur la même
+    relation (par exemple `talk.sujet` puis `talk.niveau`) s'ajoutent au lieu
+    de s'écraser.
+    """
+
+    def __init__(self):
+        self._clauses: list[dict] = []
+
+    def where(self, **clause) -> "WhereBuilder":
+        self._clauses.append(clause)
+        return self
+
+    def relation(self, name: str, **clause) -> "WhereBuilder":
+        # Relation 1:1 ou N:1 : la condition porte sur l'enregistrement lié
+        self._clauses.append({name: {"is": clause}})
+        return self
+
+    def build(self) -> dict:
+        if not self._clauses:
+            return {}
+        if len(self._clauses) == 1:
+            return self._clauses[0]
+        return {"AND": list(self._clauses)}
+
+
+def planning_filters(
+    jour: date,
+    heure: Optional[time] = None,
+    salle: Optional[int] = None,
+    sujet: Optional[str] = None,
+    niveau: Optional[str] = None,
+) -> dict:
+    """
+    Filtres de GET /plannings/planning : créneau exact si `heure` est donnée,
+    sinon la journée entière sur l'intervalle semi-ouvert [jour, jour + 1).
+    """
+    builder = WhereBuilder()
+    if heure is not None:
+        builder.where(date_heure={"equals": datetime.combine(jour, heure)})
+    else:
+        debut = datetime.combine(jour, time.min)
+        builder.where(date_heure={"gte": debut, "lt": debut + timedelta(days=1)})
+
+    if salle is not None:
+        builder.where(id_salle=salle)
+
+    # `contains` insensible à la casse : ILIKE, servi par l'index trigramme
+    if sujet:
+        builder.relation("talk", sujet={"contains": sujet, "mode": "insensitive"})
+
+    if niveau:
+        builder.relation("talk", niveau=niveau)
+
+    return builder.build()
@@ -0,0 +1,69 @@
+import asyncio
+import logging
+import os
+import resource
+from typing import Optional
+from app.core.config import settings
+from app.core.metrics import process_memory, startup_duration
+from app.core.prisma import prisma
+
+# Journal de uvicorn : le seul configuré pour afficher les messages INFO
+logger = logging.getLogger("uvicorn.error")
+
+startup_seconds: Optional[float] = None
+
+
+def _process_age() -> Optional[float]:
+    """
+    Secondes écoulées depuis la création du processus (Linux), interpréteur
+    et imports compris ; None si /proc n'est pas disponible.
+    """
+    try:
+        with open("/proc/self/stat") as f:
+            # Le nom du programme (2e champ) peut contenir des espaces
+            fields = f.read().rpartition(")")[2].split()
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+    except OSError:
+        return None
+    return uptime - int(fields[19]) / os.sysconf("SC_CLK_TCK")
+
+
+def memory_bytes() -> int:
+    """
+    Mémoire résidente du processus (pic de mémoire hors Linux).
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def report_startup() -> None:
+    """
+    Appelé à la fin du démarrage (lifespan) : durée de démarrage et mémoire
+    du worker, journalisées et exposées dans les métriques.
+    """
+    global startup_seconds
+    startup_seconds = _process_age()
+    memory = memory_bytes()
+    if startup_seconds is not None:
+        startup_duration.set(value=startup_seconds)
+    process_memory.set(value=memory)
+    logger.info(
+        "Worker %d prêt en %s, %.1f Mo",
+        os.getpid(),
+        f"{startup_seconds:.2f} s" if startup_seconds is not None else "?",
+        memory / 2**20,
+    )
+
+
+async def database_ready() -> bool:
+    if not prisma.is_connected():
+        return False
+    try:
+        await asyncio.wait_for(prisma.query_raw("SELECT 1"), settings.READY_TIMEOUT)
+    except Exception:
+        return False
+    return True
@@ -0,0 +1,60 @@
+import hashlib
+import uuid
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional
+from fastapi import Request, Response, status
+from app.core.invalidation import modified_at, version
+
+# Distingue les versions de deux processus qui auraient le même compteur
+_BOOT_ID = uuid.uuid4().hex
+
+
+def _validators(request: Request, topics: tuple, vary: str) -> tuple[str, float]:
+    key = "|".join(
+        [
+            _BOOT_ID,
+            *(f"{topic}:{version(topic)}" for topic in topics),
+            request.url.path,
+            str(sorted(request.query_params.multi_items())),
+            vary,
+        ]
+    )
+    etag = '"' + hashlib.blake2b(key.encode(), digest_size=12).hexdigest() + '"'
+    return etag, max(modified_at(topic) for topic in topics)
+
+
+def _is_fresh(request: Request, etag: str, last_modified: float) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(last_modified) <= since
+    return False
+
+
+def conditional_get(
+    request: Request, response: Response, *topics: str, vary: str = ""
+) -> Optional[Response]:
+    """
+    Calcule ETag / Last-Modified d'une liste à partir des versions des sujets
+    dont elle dépend (et des paramètres de la requête), sans accès à la base.
+    Retourne une réponse 304 si le client est à jour, sinon ajoute les en-têtes
+    à `response` et retourne None.
+    """
+    etag, last_modified = _validators(request, topics, vary)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(last_modified, usegmt=True),
+        "Cache-Control": "no-cache",
+    }
+    if _is_fresh(request, etag, last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,91 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Iterable
+from app.core.schedule import naive_utc
+
+PRODID = "-//TalkMaster//Planning//FR"
+
+
+@dataclass(frozen=True)
+class EvenementIcs:
+    uid: str
+    debut: datetime
+    duree: int
+    titre: str
+    lieu: str
+    description: str
+
+
+def _escape(text: str) -> str:
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> bytes:
+    # RFC 5545 : lignes de 75 octets au plus, suite préfixée d'un espace
+    data = line.encode()
+    if len(data) <= 75:
+        return data + b"\r\n"
+    parts = []
+    start = 0
+    limit = 75
+    while start < len(data):
+        end = min(start + limit, len(data))
+        # Ne pas couper au milieu d'un caractère UTF-8
+        while end < len(data) and (data[end] & 0xC0) == 0x80:
+            end -= 1
+        parts.append(data[start:end])
+        start = end
+        limit = 74
+    return b"\r\n ".join(parts) + b"\r\n"
+
+
+def _utc(value: datetime) -> str:
+    return naive_utc(value).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _local(value: datetime) -> str:
+    # Heure saisie par l'organisateur, affichée telle quelle par l'interface :
+    # heure « flottante » (sans Z ni TZID), lue dans le fuseau de l'abonné
+    return naive_utc(value).strftime("%Y%m%dT%H%M%S")
+
+
+def render_calendar(
+    nom: str, evenements: Iterable[EvenementIcs], dtstamp: datetime
+) -> bytes:
+    """
+    Calendrier iCalendar complet. `dtstamp` est la date de dernière
+    modification du planning : deux rendus du même planning sont identiques.
+    """
+    lignes = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{_escape(nom)}",
+    ]
+    stamp = _utc(dtstamp)
+    for evenement in evenements:
+        lignes += [
+            "BEGIN:VEVENT",
+            f"UID:{evenement.uid}",
+            f"DTSTAMP:{stamp}",
+            f"DTSTART:{_local(evenement.debut)}",
+            f"DTEND:{_local(evenement.debut + timedelta(minutes=evenement.duree))}",
+            f"SUMMARY:{_escape(evenement.titre)}",
+            f"LOCATION:{_escape(evenement.lieu)}",
+            f"DESCRIPTION:{_escape(evenement.description)}",
+            "END:VEVENT",
+        ]
+    lignes.append("END:VCALENDAR")
+    return b"".join(_fold(ligne) for ligne in lignes)
+
+
+def timestamp_to_datetime(value: float) -> datetime:
+    return datetime.fromtimestamp(value, timezone.utc)
@@ -0,0 +1,164 @@
+import asyncio
+import os
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Optional, Protocol
+from app.core.config import settings
+
+# Abonnés par sujet ("talks", "plannings", ...), notifiés après chaque écriture
+_listeners: dict[str, list[Callable[[], None]]] = defaultdict(list)
+
+# Version et date de dernière écriture de chaque sujet
+_versions: dict[str, int] = defaultdict(int)
+_started_at = time.time()
+_modified_at: dict[str, float] = defaultdict(lambda: _started_at)
+
+
+# Abonnés aux seules écritures faites par d'autres workers
+_remote_listeners: list[Callable[[list[str]], None]] = []
+
+
+def subscribe(topic: str, callback: Callable[[], None]) -> None:
+    _listeners[topic].append(callback)
+
+
+def on_remote(callback: Callable[[list[str]], None]) -> None:
+    _remote_listeners.append(callback)
+
+
+def _apply(topics) -> None:
+    now = time.time()
+    for topic in topics:
+        _versions[topic] += 1
+        _modified_at[topic] = now
+        for callback in _listeners[topic]:
+            callback()
+
+
+def notify(*topics: str) -> None:
+    """
+    Signale une écriture sur les sujets donnés : leur version est incrémentée,
+    les caches abonnés sont invalidés et les autres workers sont prévenus.
+    """
+    _apply(topics)
+    _backend.publish(topics)
+
+
+def version(topic: str) -> int:
+    return _versions[topic]
+
+
+def modified_at(topic: str) -> float:
+    return _modified_at[topic]
+
+
+class InvalidationBackend(Protocol):
+    """
+    Transport des invalidations entre processus (workers uvicorn).
+    """
+
+    def publish(self, topics) -> None: ...
+
+    async def start(self, on_remote: Callable[[list[str]], None]) -> None: ...
+
+    async def stop(self) -> None: ...
+
+
+class LocalBackend:
+    """
+    Un seul processus : rien à propager.
+    """
+
+    def publish(self, topics) -> None:
+        pass
+
+    async def start(self, on_remote) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+
+class FileBackend:
+    """
+    Bus d'invalidation par fichiers partagés, pour plusieurs workers d'une
+    même machine : un fichier par sujet, réécrit à chaque écriture avec un
+    jeton unique, et surveillé par chaque worker toutes les `interval` secondes.
+    """
+
+    def __init__(self, directory: str, interval: float):
+        self.directory = Path(directory)
+        self.interval = interval
+        self._origin = uuid.uuid4().hex
+        self._seen: dict[str, str] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def publish(self, topics) -> None:
+        for topic in topics:
+            token = f"{self._origin}:{time.time_ns()}"
+            path = self.directory / topic
+            tmp = path.with_name(f".{topic}.{self._origin}")
+            tmp.write_text(token)
+            os.replace(tmp, path)
+            self._seen[topic] = token
+
+    def _read_all(self) -> dict[str, str]:
+        tokens = {}
+        for entry in os.scandir(self.directory):
+            if entry.name.startswith(".") or not entry.is_file():
+                continue
+            try:
+                tokens[entry.name] = Path(entry.path).read_text()
+            except FileNotFoundError:
+                continue
+        return tokens
+
+    async def start(self, on_remote) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._seen = self._read_all()
+        self._task = asyncio.create_task(self._poll(on_remote))
+
+    async def _poll(self, on_remote) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            tokens = self._read_all()
+            changed = [
+                topic
+                for topic, token in tokens.items()
+                if self._seen.get(topic) != token and not token.startswith(self._origin)
+            ]
+            self._seen.update(tokens)
+            if changed:
+                on_remote(changed)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+def _create_backend() -> InvalidationBackend:
+    if settings.INVALIDATION_BACKEND == "file":
+        return FileBackend(
+            settings.INVALIDATION_DIR, settings.INVALIDATION_POLL_INTERVAL
+        )
+    return LocalBackend()
+
+
+_backend: InvalidationBackend = _create_backend()
+
+
+def _apply_remote(topics: list[str]) -> None:
+    _apply(topics)
+    for callback in _remote_listeners:
+        callback(topics)
+
+
+async def start_invalidation() -> None:
+    await _backend.start(_apply_remote)
+
+
+async def stop_invalidation() -> None:
+    await _backend.stop()
@@ -0,0 +1,230 @@
+import asyncio
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Iterable, Optional
+
+# Bornes des histogrammes de durée, en secondes
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = labels
+        registry.append(self)
+
+    def _header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, help, labels=()):
+        super().__init__(name, help, labels)
+        self._values: dict[tuple, float] = defaultdict(float)
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        self._values[labels] += amount
+
+    def render(self) -> list[str]:
+        return self._header() + [
+            f"{self.name}{_labels(self.label_names, k)} {_number(v)}"
+            for k, v in sorted(self._values.items())
+        ]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name, help, labels=()):
+        super().__init__(name, help, labels)
+        self._values: dict[tuple, float] = defaultdict(float)
+
+    def set(self, *labels, value: float) -> None:
+        self._values[labels] = value
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        self._values[labels] += amount
+
+    def dec(self, *labels, amount: float = 1) -> None:
+        self._values[labels] -= amount
+
+    def render(self) -> list[str]:
+        return self._header() + [
+            f"{self.name}{_labels(self.label_names, k)} {_number(v)}"
+            for k, v in sorted(self._values.items())
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self, name, help, labels=(), buckets: Iterable[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+        # Par jeu de labels : [compte par intervalle (+Inf inclus), somme]
+        self._values: dict[tuple, list] = {}
+
+    def observe(self, *labels, value: float) -> None:
+        data = self._values.get(labels)
+        if data is None:
+            data = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        data[0][bisect_left(self.buckets, value)] += 1
+        data[1] += value
+
+    def render(self) -> list[str]:
+        lines = self._header()
+        for key, (counts, total) in sorted(self._values.items()):
+            cumul = 0
+            for borne, count in zip((*self.buckets, float("inf")), counts):
+                cumul += count
+                le = f'le="{_number(borne)}"'
+                lines.append(
+                    f"{self.name}_bucket{_labels(self.label_names, key, le)} {cumul}"
+                )
+            lines.append(f"{self.name}_sum{_labels(self.label_names, key)} {total!r}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, key)} {cumul}")
+        return lines
+
+
+registry: list[_Metric] = []
+
+
+def render_metrics() -> str:
+    lines = []
+    for metric in registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# --- Métriques de l'application ---------------------------------------------
+
+http_requests = Counter(
+    "talkmaster_http_requests_total",
+    "Requêtes HTTP traitées.",
+    ("prefix", "method", "status"),
+)
+http_duration = Histogram(
+    "talkmaster_http_request_duration_seconds",
+    "Durée des requêtes HTTP, par préfixe de routeur.",
+    ("prefix", "method"),
+)
+http_in_flight = Gauge(
+    "talkmaster_http_requests_in_flight",
+    "Requêtes HTTP en cours de traitement.",
+    ("prefix",),
+)
+db_queries = Counter(
+    "talkmaster_db_queries_total",
+    "Requêtes Prisma exécutées.",
+    ("method",),
+)
+db_duration = Histogram(
+    "talkmaster_db_query_duration_seconds",
+    "Durée des requêtes Prisma.",
+    ("method",),
+)
+db_queries_per_request = Histogram(
+    "talkmaster_db_queries_per_request",
+    "Nombre de requêtes Prisma par requête HTTP.",
+    ("prefix",),
+    buckets=COUNT_BUCKETS,
+)
+db_time_per_request = Histogram(
+    "talkmaster_db_time_per_request_seconds",
+    "Temps passé dans Prisma par requête HTTP.",
+    ("prefix",),
+)
+hash_duration = Histogram(
+    "talkmaster_password_hash_seconds",
+    "Durée des opérations bcrypt, attente du pool de hashage comprise.",
+    ("operation",),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+loop_lag = Histogram(
+    "talkmaster_event_loop_lag_seconds",
+    "Retard de la boucle d'événements sur un réveil programmé.",
+)
+loop_lag_last = Gauge(
+    "talkmaster_event_loop_lag_last_seconds",
+    "Dernier retard mesuré de la boucle d'événements.",
+)
+startup_duration = Gauge(
+    "talkmaster_startup_seconds",
+    "Durée du démarrage du worker, de la création du processus à la fin du lifespan.",
+)
+process_memory = Gauge(
+    "talkmaster_process_resident_memory_bytes",
+    "Mémoire résidente du worker.",
+)
+
+
+def observe_query(method: str, seconds: float) -> None:
+    db_queries.inc(method)
+    db_duration.observe(method, value=seconds)
+
+
+# --- Retard de la boucle d'événements ----------------------------------------
+
+
+async def _watch_loop_lag(interval: float) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - start - interval)
+        loop_lag.observe(value=lag)
+        loop_lag_last.set(value=lag)
+
+
+_lag_task: Optional[asyncio.Task] = None
+
+
+def start_loop_monitor(interval: float) -> None:
+    global _lag_task
+    _lag_task = asyncio.create_task(_watch_loop_lag(interval))
+
+
+async def stop_loop_monitor() -> None:
+    global _lag_task
+    if _lag_task is not None:
+        _lag_task.cancel()
+        _lag_task = None
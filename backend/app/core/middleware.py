@@ -0,0 +1,183 @@
+import time
+from typing import Iterable, Optional
+from starlette.datastructures import Headers, MutableHeaders
+from app.core.compression import StreamCompressor, choose_encoding, compressed_cache
+from app.core.metrics import (
+    db_queries_per_request,
+    db_time_per_request,
+    http_duration,
+    http_in_flight,
+    http_requests,
+)
+from app.core.querylog import check_request, track_queries
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI : durée, statut et requêtes en cours par préfixe de
+    routeur (`prefixes`, ceux enregistrés dans main.py), requêtes Prisma
+    et temps base de données par requête. Ajoute l'en-tête `Server-Timing`
+    (temps base de données et total) et, en développement, signale les
+    requêtes HTTP qui dépassent les seuils de QUERY_WARNINGS.
+    """
+
+    def __init__(self, app, prefixes: Iterable[str]):
+        self.app = app
+        # Le plus long d'abord : /api/plannings avant /api
+        self.prefixes = sorted(prefixes, key=len, reverse=True)
+
+    def _prefix(self, path: str) -> str:
+        for prefix in self.prefixes:
+            if path == prefix or path.startswith(prefix + "/"):
+                return prefix
+        return "autre"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        prefix = self._prefix(scope["path"])
+        method = scope["method"]
+        status_code = 500
+        start = time.perf_counter()
+
+        with track_queries() as log:
+
+            async def send_wrapper(message):
+                nonlocal status_code
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    total = (time.perf_counter() - start) * 1000
+                    timing = f"db;dur={log.seconds * 1000:.1f}, app;dur={total:.1f}"
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (b"server-timing", timing.encode()),
+                    ]
+                await send(message)
+
+            http_in_flight.inc(prefix)
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                elapsed = time.perf_counter() - start
+                http_in_flight.dec(prefix)
+                http_requests.inc(prefix, method, str(status_code))
+                http_duration.observe(prefix, method, value=elapsed)
+                db_queries_per_request.observe(prefix, value=len(log))
+                db_time_per_request.observe(prefix, value=log.seconds)
+                check_request(log, f"{method} {scope['path']}")
+
+
+def _weaken_etag(headers: MutableHeaders) -> None:
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = "W/" + etag
+
+
+class CompressionMiddleware:
+    """
+    Middleware ASGI de compression des réponses selon Accept-Encoding.
+
+    Seuls les types de `content_types` sont compressés, et seulement au-delà
+    de `minimum_size` octets ; les réponses en plusieurs morceaux (flux JSON,
+    exports) sont compressées au fil de l'eau. `Vary: Accept-Encoding` est
+    ajouté à toute réponse compressible, compressée ou non. Quand un encodage
+    est négocié, l'ETag devient faible (même sous `minimum_size`) : il reste
+    reconnu par `conditional_get`, et un 304 porte le même ETag et le même
+    `Vary` que le 200 qu'il revalide.
+    """
+
+    def __init__(self, app, minimum_size: int, content_types: Iterable[str]):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.content_types = {t.strip().lower() for t in content_types if t.strip()}
+
+    def _compressible(self, status: int, headers: MutableHeaders) -> bool:
+        if status < 200 or status in (204, 206, 304):
+            return False
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "").partition(";")[0]
+        return content_type.strip().lower() in self.content_types
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        accept = Headers(scope=scope).get("accept-encoding", "")
+        encoding = choose_encoding(accept) if scope["method"] != "HEAD" else None
+        start = None
+        compressor: Optional[StreamCompressor] = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start, compressor, passthrough
+            if message["type"] == "http.response.start":
+                # Retenu jusqu'au premier morceau : la taille décide
+                start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is not None:
+                data = compressor.compress(body)
+                if not more_body:
+                    data += compressor.finish()
+                if data or not more_body:
+                    await send(
+                        {
+                            "type": "http.response.body",
+                            "body": data,
+                            "more_body": more_body,
+                        }
+                    )
+                return
+
+            headers = MutableHeaders(scope=start)
+            if start["status"] == 304 and "etag" in headers:
+                # Sans corps ni type : mêmes validateurs que le 200 revalidé
+                headers.add_vary_header("Accept-Encoding")
+                if encoding is not None:
+                    _weaken_etag(headers)
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+            if not self._compressible(start["status"], headers):
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+            headers.add_vary_header("Accept-Encoding")
+            if encoding is not None:
+                _weaken_etag(headers)
+            if encoding is None or (not more_body and len(body) < self.minimum_size):
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            headers["Content-Encoding"] = encoding
+            etag = headers.get("etag")
+            if more_body:
+                del headers["content-length"]
+                compressor = StreamCompressor(encoding)
+                await send(start)
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": compressor.compress(body),
+                        "more_body": True,
+                    }
+                )
+                return
+
+            data = compressed_cache.get(etag, encoding, body)
+            headers["Content-Length"] = str(len(data))
+            await send(start)
+            await send({"type": "http.response.body", "body": data})
+
+        await self.app(scope, receive, send_wrapper)
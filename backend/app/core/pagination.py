@@ -0,0 +1,63 @@
+import base64
+import json
+from typing import Any, Optional
+from fastapi import HTTPException, status
+
+# Type attendu de la valeur du curseur pour chaque clé de tri : la valeur est
+# insérée telle quelle dans la condition Prisma ou la requête SQL.
+CURSOR_TYPES = {
+    "id_talk": int,
+    "titre": str,
+    "duree": int,
+    "rank": (int, float),
+}
+
+
+def encode_cursor(sort: str, value: Any, last_id: int) -> str:
+    """
+    Encode la position (clé de tri, valeur, id) du dernier élément d'une page
+    en un curseur opaque.
+    """
+    raw = json.dumps({"s": sort, "v": value, "id": last_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> tuple[Any, int]:
+    """
+    Décode un curseur produit par `encode_cursor` pour la même clé de tri ;
+    400 si le curseur est illisible ou si sa valeur n'a pas le type de la clé.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if data["s"] != sort:
+            raise ValueError(sort)
+        value, last_id = data["v"], data["id"]
+        # bool est une sous-classe de int
+        for item, expected in ((value, CURSOR_TYPES[sort]), (last_id, int)):
+            if isinstance(item, bool) or not isinstance(item, expected):
+                raise TypeError(item)
+        return value, last_id
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Curseur de pagination invalide.",
+        )
+
+
+def keyset_where(sort: str, id_field: str, cursor: Optional[str]) -> Optional[dict]:
+    """
+    Condition Prisma sélectionnant les lignes situées après le curseur
+    pour un tri ascendant sur (sort, id_field).
+    """
+    if not cursor:
+        return None
+    value, last_id = decode_cursor(cursor, sort)
+    if sort == id_field:
+        return {id_field: {"gt": last_id}}
+    return {
+        "OR": [
+            {sort: {"gt": value}},
+            {sort: value, id_field: {"gt": last_id}},
+        ]
+    }
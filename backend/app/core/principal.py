@@ -0,0 +1,132 @@
+import time
+from dataclasses import dataclass
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.prisma import prisma
+from app.core.security import ACCESS_TOKEN_EXPIRE
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    Identité de l'utilisateur authentifié, sans mot de passe.
+    Expose les mêmes attributs que `Utilisateur` utilisés par les routes.
+    """
+
+    id_utilisateur: int
+    id_role: int
+    nom: str
+    email: str
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        return cls(
+            id_utilisateur=user.id_utilisateur,
+            id_role=user.id_role,
+            nom=user.nom,
+            email=user.email,
+        )
+
+
+# Cache des utilisateurs authentifiés, indexé par id_utilisateur
+user_cache = TTLCache(maxsize=settings.USER_CACHE_MAXSIZE, ttl=settings.USER_CACHE_TTL)
+
+
+class StaleMarkers:
+    """
+    Dates d'invalidation par clé, gardées exactement `ttl` secondes (la durée
+    de vie d'un token) : contrairement à un cache LRU, aucune marque n'est
+    évincée avant que les tokens qu'elle révoque aient expiré. Les marques
+    expirées sont purgées au plus une fois par `ttl`.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._marks: dict = {}
+        self._next_sweep = time.time() + ttl
+
+    def set(self, key, marked_at: float) -> None:
+        self._marks[key] = marked_at
+        if marked_at >= self._next_sweep:
+            limit = marked_at - self.ttl
+            self._marks = {k: t for k, t in self._marks.items() if t > limit}
+            self._next_sweep = marked_at + self.ttl
+
+    def get(self, key, default: float = 0) -> float:
+        marked_at = self._marks.get(key)
+        if marked_at is None or marked_at + self.ttl < time.time():
+            return default
+        return marked_at
+
+    def __len__(self) -> int:
+        return len(self._marks)
+
+
+# Dates d'invalidation : les tokens émis avant ne sont plus crus sur parole
+_user_stale_since = StaleMarkers(ACCESS_TOKEN_EXPIRE.total_seconds())
+_role_stale_since = StaleMarkers(ACCESS_TOKEN_EXPIRE.total_seconds())
+
+
+def invalidate_user(user_id: int) -> None:
+    """
+    À appeler après toute modification d'un utilisateur.
+    """
+    user_cache.pop(user_id)
+    _user_stale_since.set(user_id, time.time())
+
+
+def invalidate_role(id_role: int) -> None:
+    """
+    À appeler après toute modification d'un rôle.
+    """
+    user_cache.discard_if(lambda principal: principal.id_role == id_role)
+    _role_stale_since.set(id_role, time.time())
+
+
+def _principal_from_claims(user_id: int, claims: dict):
+    # Le token doit porter toutes les informations et être postérieur
+    # à la dernière invalidation de l'utilisateur ou de son rôle
+    if not all(claims.get(key) is not None for key in ("role", "nom", "email", "iat")):
+        return None
+    issued_at = claims["iat"]
+    if issued_at <= _user_stale_since.get(user_id, 0):
+        return None
+    if issued_at <= _role_stale_since.get(claims["role"], 0):
+        return None
+    return Principal(
+        id_utilisateur=user_id,
+        id_role=claims["role"],
+        nom=claims["nom"],
+        email=claims["email"],
+    )
+
+
+async def resolve_principal(user_id: int, claims: dict):
+    """
+    Résout l'utilisateur d'un token déjà décodé :
+    - AUTH_STRICT_DB_CHECK : lecture systématique en base (comportement historique) ;
+    - sinon cache LRU/TTL, puis claims du token si AUTH_TRUST_TOKEN_CLAIMS,
+      et en dernier recours lecture en base.
+    Retourne None si l'utilisateur n'existe pas.
+    """
+    if settings.AUTH_STRICT_DB_CHECK:
+        return await prisma.utilisateur.find_unique(where={"id_utilisateur": user_id})
+
+    cached = user_cache.get(user_id)
+    if cached is not None and cached.id_role == claims.get("role", cached.id_role):
+        return cached
+
+    if cached is None and settings.AUTH_TRUST_TOKEN_CLAIMS:
+        principal = _principal_from_claims(user_id, claims)
+        if principal is not None:
+            user_cache.set(user_id, principal)
+            return principal
+
+    user = await prisma.utilisateur.find_unique(where={"id_utilisateur": user_id})
+    if user is None:
+        user_cache.pop(user_id)
+        return None
+
+    principal = Principal.from_user(user)
+    user_cache.set(user_id, principal)
+    return principal
@@ -1,11 +1,119 @@
+import time
+from datetime import timedelta
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 from prisma import Prisma
+from app.core.config import settings
+from app.core.querylog import record_query
 
-prisma = Prisma()
+
+def _pooled_url(url: str) -> str:
+    """
+    Ajoute la taille du pool et le délai d'attente d'une connexion libre
+    à l'URL de la base, sauf s'ils y sont déjà précisés.
+    """
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query))
+    query.setdefault("connection_limit", str(settings.DB_POOL_SIZE))
+    query.setdefault("pool_timeout", str(settings.DB_POOL_TIMEOUT))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+class InstrumentedPrisma(Prisma):
+    """
+    Client Prisma qui enregistre chaque requête avec sa durée (métriques,
+    journal de la requête HTTP en cours, alertes en développement).
+    Les lots `batch_()` passent directement par le moteur et ne sont pas
+    comptés.
+    """
+
+    async def _execute(self, *, method, model=None, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await super()._execute(method=method, model=model, **kwargs)
+        finally:
+            record_query(
+                method,
+                model.__name__ if model is not None else None,
+                time.perf_counter() - start,
+            )
+
+
+# Client unique partagé par toute l'application : la connexion est ouverte
+# au démarrage (lifespan) et aucune route ne doit créer son propre client.
+prisma = InstrumentedPrisma(
+    datasource=(
+        {"url": _pooled_url(settings.DATABASE_URL)} if settings.DATABASE_URL else None
+    ),
+    connect_timeout=timedelta(seconds=settings.DB_CONNECT_TIMEOUT),
+)
 
 
 async def connect():
-    await prisma.connect()
+    if not prisma.is_connected():
+        await prisma.connect()
 
 
 async def disconnect():
-    await prisma.disconnect()
+    if prisma.is_connected():
+        await prisma.disconnect()
+
+
+async def select_many(model, selection: list[str], **arguments) -> list[dict]:
+    """
+    find_many limité aux champs de `selection` : scalaires, ou relation avec
+    ses champs ("conferencier { nom email }"). Renvoie les lignes brutes du
+    moteur (dates en ISO 8601) sans construire de modèle. Prisma Client Python
+    n'a pas de `select` : la sélection passe par `root_selection`, comme pour
+    count().
+    """
+    if "order" in arguments:
+        arguments["order_by"] = arguments.pop("order")
+    response = await prisma._execute(
+        method="find_many",
+        model=model,
+        arguments=arguments,
+        root_selection=selection,
+    )
+    return response["data"]["result"]
+
+
+async def select_unique(model, selection: list[str], where: dict) -> Optional[dict]:
+    """
+    find_unique limité aux champs de `selection` (voir `select_many`).
+    """
+    response = await prisma._execute(
+        method="find_unique",
+        model=model,
+        arguments={"where": where},
+        root_selection=selection,
+    )
+    return response["data"]["result"]
+
+
+async def pool_metrics() -> dict:
+    """
+    Configuration du pool et état courant remonté par le moteur Prisma
+    (connexions ouvertes/occupées, requêtes en attente d'une connexion).
+    """
+    metrics = await prisma.get_metrics()
+    gauges = {metric.key: metric.value for metric in metrics.gauges}
+    wait = next(
+        (
+            metric.value
+            for metric in metrics.histograms
+            if metric.key == "prisma_client_queries_wait_histogram_ms"
+        ),
+        None,
+    )
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "connect_timeout": settings.DB_CONNECT_TIMEOUT,
+        "connections_open": gauges.get("prisma_pool_connections_open", 0),
+        "connections_busy": gauges.get("prisma_pool_connections_busy", 0),
+        "connections_idle": gauges.get("prisma_pool_connections_idle", 0),
+        "queries_waiting": gauges.get("prisma_client_queries_wait", 0),
+        "wait_count": wait.count if wait else 0,
+        "wait_ms_total": wait.sum if wait else 0.0,
+    }
@@ -0,0 +1,139 @@
+import contextvars
+import logging
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+from app.core.config import settings
+from app.core.metrics import observe_query
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class QueryRecord:
+    method: str
+    model: Optional[str]
+    seconds: float
+
+    def __str__(self) -> str:
+        cible = f" {self.model}" if self.model else ""
+        return f"{self.method}{cible} ({self.seconds * 1000:.1f} ms)"
+
+
+@dataclass
+class QueryLog:
+    """
+    Requêtes Prisma exécutées pendant une requête HTTP (ou un bloc de test).
+    """
+
+    records: list[QueryRecord] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @property
+    def seconds(self) -> float:
+        return sum(record.seconds for record in self.records)
+
+    def repeated(self, minimum: int = 2) -> list[tuple[tuple[str, Optional[str]], int]]:
+        """
+        Couples (méthode, modèle) exécutés au moins `minimum` fois :
+        signe habituel d'un N+1.
+        """
+        compte = Counter((r.method, r.model) for r in self.records)
+        return [(cle, n) for cle, n in compte.most_common() if n >= minimum]
+
+    def summary(self) -> str:
+        return "\n".join(f"  {i}. {record}" for i, record in enumerate(self.records, 1))
+
+
+# Journal de la requête HTTP en cours (posé par le middleware)
+_current: contextvars.ContextVar[Optional[QueryLog]] = contextvars.ContextVar(
+    "query_log", default=None
+)
+
+# Captures globales (tous contextes et threads confondus), pour les tests
+_captures: list[QueryLog] = []
+
+
+def record_query(method: str, model: Optional[str], seconds: float) -> None:
+    observe_query(method, seconds)
+    record = QueryRecord(method, model, seconds)
+    log = _current.get()
+    if log is not None:
+        log.records.append(record)
+    for capture in _captures:
+        capture.records.append(record)
+    if settings.QUERY_WARNINGS and seconds * 1000 >= settings.QUERY_SLOW_MS:
+        logger.warning("Requête Prisma lente : %s", record)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryLog]:
+    """
+    Enregistre les requêtes exécutées dans le contexte courant (tâche asyncio).
+    """
+    log = QueryLog()
+    token = _current.set(log)
+    try:
+        yield log
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def capture_queries() -> Iterator[QueryLog]:
+    """
+    Enregistre toutes les requêtes exécutées pendant le bloc, quel que soit
+    le contexte : fonctionne aussi avec TestClient, qui exécute l'application
+    dans un autre thread.
+    """
+    log = QueryLog()
+    _captures.append(log)
+    try:
+        yield log
+    finally:
+        _captures.remove(log)
+
+
+def check_request(log: QueryLog, label: str) -> None:
+    """
+    En développement (QUERY_WARNINGS), signale les requêtes HTTP qui
+    dépassent QUERY_MAX_PER_REQUEST requêtes ou répètent la même requête.
+    """
+    if not settings.QUERY_WARNINGS:
+        return
+    if len(log) > settings.QUERY_MAX_PER_REQUEST:
+        logger.warning(
+            "%s : %d requêtes Prisma (%.1f ms, seuil %d)\n%s",
+            label,
+            len(log),
+            log.seconds * 1000,
+            settings.QUERY_MAX_PER_REQUEST,
+            log.summary(),
+        )
+    for (method, model), n in log.repeated(settings.QUERY_REPEAT_THRESHOLD):
+        logger.warning(
+            "%s : N+1 probable, %s %s exécuté %d fois", label, method, model, n
+        )
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def assert_max_queries(maximum: int) -> Iterator[QueryLog]:
+    """
+    Échoue si le bloc exécute plus de `maximum` requêtes Prisma.
+
+        with assert_max_queries(3):
+            client.patch("/api/talks/1/schedule", ...)
+    """
+    with capture_queries() as log:
+        yield log
+    if len(log) > maximum:
+        raise QueryBudgetExceeded(
+            f"{len(log)} requêtes Prisma pour un budget de {maximum} :\n{log.summary()}"
+        )
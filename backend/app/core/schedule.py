@@ -0,0 +1,198 @@
+from bisect import bisect_left, insort
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Iterable, Optional
+from app.core.config import settings
+from app.core.prisma import prisma
+
+
+def naive_utc(value: datetime) -> datetime:
+    """
+    Ramène un datetime à l'heure UTC sans fuseau, comme stocké par Prisma.
+    """
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+@dataclass(frozen=True, order=True)
+class Creneau:
+    """
+    Occupation d'une salle sur l'intervalle semi-ouvert [debut, fin).
+    """
+
+    debut: datetime
+    fin: datetime
+    id_talk: int
+
+
+class RoomIndex:
+    """
+    Créneaux occupés d'une salle, triés par début.
+
+    Un créneau ne peut chevaucher [debut, fin) que s'il commence dans
+    [debut - plus_long, fin) : la recherche se fait par dichotomie en
+    O(log n + k), k étant le nombre de créneaux candidats.
+    """
+
+    def __init__(self):
+        self._creneaux: list[Creneau] = []
+        self._by_talk: dict[int, Creneau] = {}
+        self._plus_long = timedelta(0)
+
+    def __len__(self) -> int:
+        return len(self._creneaux)
+
+    def __iter__(self):
+        return iter(self._creneaux)
+
+    def add(self, creneau: Creneau) -> None:
+        self.remove(creneau.id_talk)
+        insort(self._creneaux, creneau)
+        self._by_talk[creneau.id_talk] = creneau
+        self._plus_long = max(self._plus_long, creneau.fin - creneau.debut)
+
+    def remove(self, id_talk: int) -> Optional[Creneau]:
+        creneau = self._by_talk.pop(id_talk, None)
+        if creneau is not None:
+            del self._creneaux[bisect_left(self._creneaux, creneau)]
+        return creneau
+
+    def conflicts(
+        self, debut: datetime, fin: datetime, ignore_talk: Optional[int] = None
+    ) -> list[Creneau]:
+        lo = bisect_left(self._creneaux, debut - self._plus_long, key=_debut)
+        hi = bisect_left(self._creneaux, fin, key=_debut)
+        return [
+            creneau
+            for creneau in self._creneaux[lo:hi]
+            if creneau.fin > debut and creneau.id_talk != ignore_talk
+        ]
+
+    def free_slots(
+        self, debut: datetime, fin: datetime, duree_min: timedelta = timedelta(0)
+    ) -> list[tuple[datetime, datetime]]:
+        """
+        Intervalles libres de [debut, fin) d'au moins `duree_min`.
+        """
+        libres = []
+        curseur = debut
+        for creneau in self.conflicts(debut, fin):
+            if creneau.debut > curseur and creneau.debut - curseur >= duree_min:
+                libres.append((curseur, creneau.debut))
+            curseur = max(curseur, creneau.fin)
+        if fin > curseur and fin - curseur >= duree_min:
+            libres.append((curseur, fin))
+        return libres
+
+
+def _debut(creneau: Creneau) -> datetime:
+    return creneau.debut
+
+
+class ScheduleIndex:
+    """
+    Index des créneaux occupés, par salle.
+    """
+
+    def __init__(self):
+        self.rooms: dict[int, RoomIndex] = defaultdict(RoomIndex)
+        self._room_of_talk: dict[int, int] = {}
+
+    @classmethod
+    def from_plannings(cls, plannings: Iterable) -> "ScheduleIndex":
+        # Plannings chargés avec `include={"talk": True}`
+        index = cls()
+        for planning in plannings:
+            index.add(
+                planning.id_salle,
+                planning.date_heure,
+                planning.talk.duree,
+                planning.id_talk,
+            )
+        return index
+
+    def add(self, id_salle: int, debut: datetime, duree: int, id_talk: int) -> Creneau:
+        self.remove(id_talk)
+        debut = naive_utc(debut)
+        creneau = Creneau(debut, debut + timedelta(minutes=duree), id_talk)
+        self.rooms[id_salle].add(creneau)
+        self._room_of_talk[id_talk] = id_salle
+        return creneau
+
+    def remove(self, id_talk: int) -> None:
+        id_salle = self._room_of_talk.pop(id_talk, None)
+        if id_salle is not None:
+            self.rooms[id_salle].remove(id_talk)
+
+    def conflicts(
+        self,
+        id_salle: int,
+        debut: datetime,
+        duree: int,
+        ignore_talk: Optional[int] = None,
+    ) -> list[Creneau]:
+        debut = naive_utc(debut)
+        if id_salle not in self.rooms:
+            return []
+        return self.rooms[id_salle].conflicts(
+            debut, debut + timedelta(minutes=duree), ignore_talk
+        )
+
+    def free_slots(
+        self, id_salle: int, debut: datetime, fin: datetime, duree_min: int = 0
+    ) -> list[tuple[datetime, datetime]]:
+        return self.rooms[id_salle].free_slots(
+            naive_utc(debut), naive_utc(fin), timedelta(minutes=duree_min)
+        )
+
+
+async def load_schedule(
+    salles: Optional[Iterable[int]], debut: datetime, fin: datetime
+) -> ScheduleIndex:
+    """
+    Charge en une requête les créneaux des salles données (toutes si None)
+    susceptibles de chevaucher [debut, fin).
+    """
+    where = {
+        "date_heure": {
+            "gte": naive_utc(debut)
+            - timedelta(minutes=settings.SCHEDULE_MAX_TALK_DUREE),
+            "lt": naive_utc(fin),
+        },
+    }
+    if salles is not None:
+        where["id_salle"] = {"in": list(salles)}
+    plannings = await prisma.planning.find_many(where=where, include={"talk": True})
+    return ScheduleIndex.from_plannings(plannings)
+
+
+async def load_room_schedule(
+    id_salle: int, debut: datetime, fin: datetime
+) -> ScheduleIndex:
+    """
+    Charge les créneaux de la salle susceptibles de chevaucher [debut, fin).
+    """
+    return await load_schedule([id_salle], debut, fin)
+
+
+async def find_conflicts(
+    id_salle: int, debut: datetime, duree: int, ignore_talk: Optional[int] = None
+) -> list[Creneau]:
+    """
+    Créneaux de la salle qui chevauchent [debut, debut + duree).
+    """
+    fin = naive_utc(debut) + timedelta(minutes=duree)
+    index = await load_room_schedule(id_salle, debut, fin)
+    return index.conflicts(id_salle, debut, duree, ignore_talk)
+
+
+def day_window(jour: date) -> tuple[datetime, datetime]:
+    """
+    Plage horaire ouvrée d'une journée (SCHEDULE_DAY_START à SCHEDULE_DAY_END).
+    """
+    return (
+        datetime.combine(jour, time.fromisoformat(settings.SCHEDULE_DAY_START)),
+        datetime.combine(jour, time.fromisoformat(settings.SCHEDULE_DAY_END)),
+    )
@@ -0,0 +1,94 @@
+import re
+from typing import Optional
+from app.core.prisma import prisma
+
+# Doit rester identique à l'expression de l'index "Talk_recherche_idx"
+# (migration add_talk_search_index) pour que PostgreSQL l'utilise.
+TALK_DOCUMENT = (
+    "setweight(to_tsvector('french', coalesce(t.titre, '')), 'A') || "
+    "setweight(to_tsvector('french', coalesce(t.sujet, '')), 'B') || "
+    "setweight(to_tsvector('french', coalesce(t.description, '')), 'C')"
+)
+
+_MOT = re.compile(r"\w+", re.UNICODE)
+
+
+def build_tsquery(q: str) -> Optional[str]:
+    """
+    Transforme une saisie libre en requête `to_tsquery` : tous les mots sont
+    requis et le dernier est recherché en préfixe (saisie en cours).
+    Retourne None si la saisie ne contient aucun mot.
+    """
+    mots = _MOT.findall(q.lower())
+    if not mots:
+        return None
+    termes = mots[:-1] + [f"{mots[-1]}:*"]
+    return " & ".join(termes)
+
+
+def _search_conditions(
+    q: str, statut: Optional[str], niveau: Optional[str]
+) -> Optional[tuple[list, list[str]]]:
+    # $1 est toujours la requête plein texte
+    tsquery = build_tsquery(q)
+    if tsquery is None:
+        return None
+    params: list = [tsquery]
+    conditions = [f"({TALK_DOCUMENT}) @@ to_tsquery('french', $1)"]
+    if statut:
+        params.append(statut)
+        conditions.append(f't.statut = ${len(params)}::"StatutTalk"')
+    if niveau:
+        params.append(niveau)
+        conditions.append(f't.niveau = ${len(params)}::"Niveau"')
+    return params, conditions
+
+
+async def search_talk_ids(
+    q: str,
+    statut: Optional[str] = None,
+    niveau: Optional[str] = None,
+    after: Optional[tuple[float, int]] = None,
+    limit: int = 20,
+) -> list[tuple[int, float]]:
+    """
+    Identifiants des talks correspondant à `q`, triés par pertinence
+    décroissante puis par id, avec leur score. `after` est la position
+    (score, id) du dernier résultat de la page précédente.
+    """
+    recherche = _search_conditions(q, statut, niveau)
+    if recherche is None:
+        return []
+    params, conditions = recherche
+
+    rank = f"ts_rank({TALK_DOCUMENT}, to_tsquery('french', $1))::float8"
+    if after is not None:
+        params.extend(after)
+        r, i = f"${len(params) - 1}::float8", f"${len(params)}::int"
+        conditions.append(f"({rank} < {r} OR ({rank} = {r} AND t.id_talk > {i}))")
+
+    rows = await prisma.query_raw(
+        f"""
+        SELECT t.id_talk, {rank} AS rank
+        FROM "Talk" t
+        WHERE {" AND ".join(conditions)}
+        ORDER BY rank DESC, t.id_talk
+        LIMIT {int(limit)}
+        """,
+        *params,
+    )
+    return [(row["id_talk"], row["rank"]) for row in rows]
+
+
+async def count_search(
+    q: str, statut: Optional[str] = None, niveau: Optional[str] = None
+) -> int:
+    recherche = _search_conditions(q, statut, niveau)
+    if recherche is None:
+        return 0
+    params, conditions = recherche
+    rows = await prisma.query_raw(
+        f'SELECT count(*)::int AS total FROM "Talk" t WHERE {" AND ".join(conditions)}',
+        *params,
+    )
+    return rows[0]["total"]
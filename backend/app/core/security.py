@@ -1,14 +1,27 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from jose import jwt, JWTError
+from typing import Optional
+from fastapi import HTTPException, status
+from jose import jwt
 from passlib.context import CryptContext
-from fastapi.security import OAuth2PasswordBearer
 from app.core.config import settings
-from fastapi import HTTPException, status, Depends
-from prisma import Prisma
+from app.core.metrics import hash_duration
 from app.models import utilisateur
 
-# Configurer le contexte pour le hashage des mots de passe
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Configurer le contexte pour le hashage des mots de passe.
+# Un hash dont le coût diffère de BCRYPT_ROUNDS est signalé comme à mettre à jour.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+# Durée de vie des tokens d'accès
+ACCESS_TOKEN_EXPIRE = timedelta(hours=1)
 
 
 # Fonction pour hasher un mot de passe
@@ -21,44 +34,80 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
-# Fonction pour créer un token JWT incluant le rôle
-def create_access_token(
-    data: dict, utilisateur: utilisateur, expires_delta: timedelta = timedelta(hours=1)
-) -> str:
-    to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + expires_delta
-    to_encode.update({"exp": expire, "role": utilisateur.id_role})
+# Vérifie le mot de passe et retourne un nouveau hash si le coût a changé
+def verify_and_update(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
 
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm="HS256")
-    return encoded_jwt
 
+def _create_hash_executor() -> Executor:
+    if settings.HASH_EXECUTOR == "process":
+        return ProcessPoolExecutor(max_workers=settings.HASH_WORKERS)
+    return ThreadPoolExecutor(
+        max_workers=settings.HASH_WORKERS, thread_name_prefix="bcrypt"
+    )
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
+# Pool dédié au hashage : bcrypt ne doit jamais bloquer la boucle d'événements
+_hash_executor = _create_hash_executor()
+_hash_pending = 0
 
-# Décoder le token et récupérer l'utilisateur
-async def get_current_user(token: str = Depends(oauth2_scheme)):
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Impossible de valider les identifiants.",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
 
+async def _run_hashing(func, *args):
+    """
+    Exécute `func` dans le pool de hashage. Au-delà de HASH_MAX_PENDING
+    opérations en cours ou en attente, répond 503 avec Retry-After.
+    """
+    global _hash_pending
+    if _hash_pending >= settings.HASH_MAX_PENDING:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Serveur surchargé, veuillez réessayer.",
+            headers={"Retry-After": str(settings.HASH_RETRY_AFTER)},
+        )
+    _hash_pending += 1
+    start = time.perf_counter()
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
-        user_id: int = int(payload.get("sub"))
-        if user_id is None:
-            raise credentials_exception
-    except (JWTError, ValueError):
-        raise credentials_exception
-
-    db = Prisma()
-    await db.connect()
-    try:
-        user = await db.utilisateur.find_unique(where={"id_utilisateur": user_id})
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_hash_executor, func, *args)
     finally:
-        await db.disconnect()
+        _hash_pending -= 1
+        hash_duration.observe(func.__name__, value=time.perf_counter() - start)
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_hashing(hash_password, password)
+
 
-    if user is None:
-        raise credentials_exception
-    return user
+async def verify_and_update_async(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, Optional[str]]:
+    return await _run_hashing(verify_and_update, plain_password, hashed_password)
+
+
+def shutdown_hashing() -> None:
+    _hash_executor.shutdown(wait=True)
+
+
+# Fonction pour créer un token JWT incluant le rôle et l'identité
+# (ces claims permettent de résoudre l'utilisateur sans requête en base)
+def create_access_token(
+    data: dict,
+    utilisateur: utilisateur,
+    expires_delta: timedelta = ACCESS_TOKEN_EXPIRE,
+) -> str:
+    to_encode = data.copy()
+    now = datetime.now(timezone.utc)
+    to_encode.update(
+        {
+            "iat": int(now.timestamp()),
+            "exp": now + expires_delta,
+            "role": utilisateur.id_role,
+            "nom": utilisateur.nom,
+            "email": utilisateur.email,
+        }
+    )
+
+    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm="HS256")
+    return encoded_jwt
@@ -0,0 +1,102 @@
+import datetime
+import enum
+import json
+from typing import Any
+from fastapi import Response
+
+try:
+    import orjson
+except ImportError:  # dépendance facultative : repli sur json
+    orjson = None
+
+
+def _default(value):
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    raise TypeError(f"{type(value).__name__} non sérialisable en JSON")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    JSON compact en UTF-8 ; dates, heures et enums au même format que
+    pydantic. orjson s'il est installé, sinon json.
+    """
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(
+        content, ensure_ascii=False, separators=(",", ":"), default=_default
+    ).encode()
+
+
+class FastJSONResponse(Response):
+    """
+    Réponse JSON pour les listes déjà mises en forme par `talk_row` /
+    `planning_row` : ni validation par `response_model` (qui ne sert plus
+    qu'à la documentation), ni passage par `jsonable_encoder`.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+# Mise en forme directe des lignes Prisma, champ pour champ identique à
+# TalkOut / PlanningOut : les types viennent du schéma Prisma, une seconde
+# validation n'apporte rien.
+
+
+def _conferencier_row(utilisateur) -> dict:
+    # Mêmes champs que UtilisateurOut : jamais le mot de passe
+    return {
+        "nom": utilisateur.nom,
+        "email": utilisateur.email,
+        "id_utilisateur": utilisateur.id_utilisateur,
+        "id_role": utilisateur.id_role,
+    }
+
+
+def talk_row(talk) -> dict:
+    """
+    TalkOut d'un talk chargé avec `conferencier` (et `planning` pour la date
+    et l'heure).
+    """
+    planning = talk.planning
+    return {
+        "id_talk": talk.id_talk,
+        "titre": talk.titre,
+        "sujet": talk.sujet,
+        "description": talk.description,
+        "duree": talk.duree,
+        "niveau": talk.niveau,
+        "statut": talk.statut,
+        "id_conferencier": talk.id_conferencier,
+        "conferencier": (
+            _conferencier_row(talk.conferencier) if talk.conferencier else None
+        ),
+        "date": planning.date_heure.date() if planning else None,
+        "heure": planning.date_heure.time() if planning else None,
+    }
+
+
+def planning_row(planning, secondes: bool = False) -> dict:
+    """
+    PlanningOut d'un planning chargé avec `talk` et `salle` : date
+    'YYYY-MM-DD', heure 'HH:MM' (ou 'HH:MM:SS' avec `secondes`).
+    """
+    # Découpage de isoformat() : plusieurs fois plus rapide que strftime
+    iso = planning.date_heure.isoformat()
+    return {
+        "id_planning": planning.id_planning,
+        "talk_id": planning.talk.id_talk,
+        "talk_titre": planning.talk.titre,
+        "talk_description": planning.talk.description,
+        "talk_statut": planning.talk.statut,
+        "salle_nom": planning.salle.nom_salle,
+        "date": iso[:10],
+        "heure": iso[11:19] if secondes else iso[11:16],
+        "salle_id": planning.id_salle,
+        "talk_duree": planning.talk.duree,
+    }
@@ -0,0 +1,156 @@
+import heapq
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, Optional
+from app.core.schedule import ScheduleIndex, naive_utc
+
+
+@dataclass(frozen=True)
+class TalkASolver:
+    id_talk: int
+    duree: int
+    niveau: str
+    sujet: str
+
+
+@dataclass(frozen=True)
+class SalleASolver:
+    id_salle: int
+    capacite: int
+
+
+@dataclass(frozen=True)
+class Grille:
+    """
+    Jours et plage horaire disponibles, découpés en pas de `pas` minutes.
+    """
+
+    jours: tuple[date, ...]
+    debut: time
+    fin: time
+    pas: int = 30
+
+
+@dataclass(frozen=True)
+class Affectation:
+    id_talk: int
+    id_salle: int
+    date_heure: datetime
+
+
+def _ceil_to_step(minute: int, pas: int) -> int:
+    return -(-minute // pas) * pas
+
+
+def solve(
+    talks: Iterable[TalkASolver],
+    salles: Iterable[SalleASolver],
+    grille: Grille,
+    existing: Optional[ScheduleIndex] = None,
+    poids_niveau: float = 1.0,
+    poids_sujet: float = 2.0,
+    candidats: int = 8,
+) -> tuple[list[Affectation], list[int]]:
+    """
+    Place les talks sans chevauchement dans les salles de la grille.
+
+    Heuristique gloutonne : les talks les plus longs sont placés d'abord.
+    Chaque couple (jour, salle) a un curseur sur sa prochaine minute libre,
+    et un tas ordonné par (curseur, -capacité) donne les `candidats`
+    positions les plus tôt. La position retenue est celle qui minimise les
+    talks de même sujet ou niveau programmés en parallèle, puis l'heure.
+    Les créneaux de `existing` (planning déjà en place) sont évités.
+
+    Retourne les affectations et les identifiants des talks non placés.
+    """
+    index = existing if existing is not None else ScheduleIndex()
+    salles = sorted(salles, key=lambda salle: -salle.capacite)
+    pas = grille.pas
+    jour_debut = grille.debut.hour * 60 + grille.debut.minute
+    jour_fin = grille.fin.hour * 60 + grille.fin.minute
+
+    # Tas des positions : (curseur en minutes, -capacité, jour, id_salle)
+    tas = [
+        (jour_debut, -salle.capacite, j, salle.id_salle)
+        for j in range(len(grille.jours))
+        for salle in salles
+    ]
+    heapq.heapify(tas)
+
+    # Nombre de talks par (jour, pas de grille) et par sujet / niveau
+    sujets: dict[tuple[int, int], Counter] = defaultdict(Counter)
+    niveaux: dict[tuple[int, int], Counter] = defaultdict(Counter)
+
+    def minute_to_datetime(j: int, minute: int) -> datetime:
+        return datetime.combine(grille.jours[j], time()) + timedelta(minutes=minute)
+
+    def next_free(j: int, id_salle: int, minute: int, duree: int) -> Optional[int]:
+        # Avance le début au-delà des créneaux existants qui le chevauchent
+        while minute + duree <= jour_fin:
+            conflits = index.conflicts(id_salle, minute_to_datetime(j, minute), duree)
+            if not conflits:
+                return minute
+            fin = max(naive_utc(c.fin) for c in conflits)
+            minute = _ceil_to_step(
+                int((fin - minute_to_datetime(j, 0)).total_seconds() // 60), pas
+            )
+        return None
+
+    def penalite(j: int, minute: int, talk: TalkASolver) -> float:
+        total = 0.0
+        for slot in range(
+            minute // pas, _ceil_to_step(minute + talk.duree, pas) // pas
+        ):
+            total += poids_sujet * sujets[(j, slot)][talk.sujet]
+            total += poids_niveau * niveaux[(j, slot)][talk.niveau]
+        return total
+
+    affectations = []
+    non_places = []
+
+    for talk in sorted(talks, key=lambda t: (-t.duree, t.id_talk)):
+        examines = []
+        trop_pleines = []
+        meilleur = None
+        while tas and len(examines) < candidats:
+            position = heapq.heappop(tas)
+            minute, capacite, j, id_salle = position
+            debut = next_free(j, id_salle, minute, talk.duree)
+            if debut is None:
+                # Plus de place pour ce talk : gardée pour des talks plus courts
+                trop_pleines.append(position)
+                continue
+            if debut != minute:
+                heapq.heappush(tas, (debut, capacite, j, id_salle))
+                continue
+            examines.append(position)
+            score = (penalite(j, debut, talk), debut, j)
+            if meilleur is None or score < meilleur[0]:
+                meilleur = (score, position)
+
+        for position in trop_pleines:
+            heapq.heappush(tas, position)
+        for position in examines:
+            if meilleur is None or position is not meilleur[1]:
+                heapq.heappush(tas, position)
+
+        if meilleur is None:
+            non_places.append(talk.id_talk)
+            continue
+
+        minute, capacite, j, id_salle = meilleur[1]
+        date_heure = minute_to_datetime(j, minute)
+        index.add(id_salle, date_heure, talk.duree, talk.id_talk)
+        for slot in range(
+            minute // pas, _ceil_to_step(minute + talk.duree, pas) // pas
+        ):
+            sujets[(j, slot)][talk.sujet] += 1
+            niveaux[(j, slot)][talk.niveau] += 1
+        heapq.heappush(
+            tas, (_ceil_to_step(minute + talk.duree, pas), capacite, j, id_salle)
+        )
+        affectations.append(Affectation(talk.id_talk, id_salle, date_heure))
+
+    affectations.sort(key=lambda a: (a.date_heure, a.id_salle))
+    return affectations, non_places
@@ -2,15 +2,45 @@ from fastapi import FastAPI
 from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.core.prisma import prisma
-from app.api.routes import talks, auth, plannings, roles, rooms, users
+from app.core.feedback import feedback_buffer
+from app.core.health import report_startup
+from app.core.invalidation import start_invalidation, stop_invalidation
+from app.core.metrics import start_loop_monitor, stop_loop_monitor
+from app.core.middleware import CompressionMiddleware, MetricsMiddleware
+from app.core.prisma import connect, disconnect
+from app.core.security import shutdown_hashing
+from app.api.routes import (
+    talks,
+    auth,
+    plannings,
+    roles,
+    rooms,
+    users,
+    system,
+    stats,
+    favorites,
+    feedbacks,
+    feeds,
+    health,
+    metrics,
+)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    await prisma.connect()
+    # Une seule connexion (pool) pour toute la durée de vie de l'application
+    await connect()
+    await start_invalidation()
+    feedback_buffer.start()
+    if settings.METRICS_ENABLED:
+        start_loop_monitor(settings.LOOP_LAG_INTERVAL)
+    report_startup()
     yield
-    await prisma.disconnect()
+    await stop_loop_monitor()
+    await feedback_buffer.stop()
+    await stop_invalidation()
+    await disconnect()
+    shutdown_hashing()
 
 
 app = FastAPI(title="TalkMaster API", lifespan=lifespan, debug=False)
@@ -27,10 +57,37 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Routes
-app.include_router(users.router, prefix="/api/utilisateurs", tags=["Utilisateurs"])
-app.include_router(auth.router, prefix="/api/auth", tags=["Auth"])
-app.include_router(talks.router, prefix="/api/talks", tags=["Talks"])
-app.include_router(plannings.router, prefix="/api/plannings", tags=["Plannings"])
-app.include_router(rooms.router, prefix="/api/salles", tags=["Salles"])
-app.include_router(roles.router, prefix="/api/roles", tags=["Roles"])
+# Routes : (routeur, préfixe, tag). Les préfixes servent aussi de labels
+# aux métriques HTTP.
+ROUTERS = [
+    (users.router, "/api/utilisateurs", "Utilisateurs"),
+    (auth.router, "/api/auth", "Auth"),
+    (talks.router, "/api/talks", "Talks"),
+    (plannings.router, "/api/plannings", "Plannings"),
+    (rooms.router, "/api/salles", "Salles"),
+    (roles.router, "/api/roles", "Roles"),
+    (favorites.router, "/api/favoris", "Favoris"),
+    (feedbacks.router, "/api/feedbacks", "Feedbacks"),
+    (feeds.router, "/api/calendrier", "Calendrier"),
+    (stats.router, "/api/stats", "Statistiques"),
+    (system.router, "/api/system", "Système"),
+]
+for router, prefix, tag in ROUTERS:
+    app.include_router(router, prefix=prefix, tags=[tag])
+
+# Sondes de vivacité et de disponibilité, à la racine comme /metrics
+app.include_router(health.router)
+if settings.METRICS_ENABLED:
+    app.include_router(metrics.router)
+if settings.METRICS_ENABLED or settings.QUERY_WARNINGS:
+    app.add_middleware(
+        MetricsMiddleware,
+        prefixes=[prefix for _, prefix, _ in ROUTERS]
+        + ["/metrics", "/healthz", "/readyz"],
+    )
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        content_types=settings.COMPRESSION_TYPES,
+    )
@@ -0,0 +1,36 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+from app.models.talk import Niveau, StatutTalk
+
+
+class FavoriOut(BaseModel):
+    id_talk: int
+    favori: bool
+    nb_favoris: int
+
+
+class TalkPopulaire(BaseModel):
+    id_talk: int
+    titre: str
+    sujet: str
+    niveau: Niveau
+    statut: StatutTalk
+    duree: int
+    nb_favoris: int
+
+    class Config:
+        from_attributes = True
+
+
+# Talk favori, avec son créneau s'il est planifié
+class AgendaItem(BaseModel):
+    id_talk: int
+    titre: str
+    sujet: str
+    niveau: Niveau
+    duree: int
+    id_planning: Optional[int] = None
+    date_heure: Optional[datetime] = None
+    id_salle: Optional[int] = None
+    nom_salle: Optional[str] = None
@@ -0,0 +1,21 @@
+from pydantic import BaseModel, Field
+from typing import Dict, Optional
+
+
+class FeedbackCreate(BaseModel):
+    id_talk: int
+    note: int = Field(..., ge=1, le=5)
+    commentaire: str = Field("", max_length=2000)
+
+
+# Feedback accepté, écrit en base avec le prochain lot
+class FeedbackRecu(BaseModel):
+    id_talk: int
+    note: int
+    en_attente: int
+
+
+class NotesOut(BaseModel):
+    nb: int
+    moyenne: Optional[float] = None
+    histogramme: Dict[int, int]
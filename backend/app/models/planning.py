@@ -1,5 +1,6 @@
-from pydantic import BaseModel
-from datetime import date, time
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import date, datetime, time
 
 
 class PlanningBase(BaseModel):
@@ -16,12 +17,13 @@ class PlanningOut(BaseModel):
     id_planning: int
     talk_id: int
     talk_titre: str
-    talk_description: str
+    talk_description: Optional[str] = None
     talk_statut: str
     salle_nom: str
     date: str
     heure: str
     salle_id: int
+    talk_duree: Optional[int] = None
 
     class Config:
         from_attributes = True
@@ -35,3 +37,48 @@ class PlanningUpdate(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+# Créneau libre d'une salle
+class CreneauLibre(BaseModel):
+    debut: datetime
+    fin: datetime
+    duree: int
+
+
+# Affectation d'un talk à une salle et un créneau (planification en lot)
+class PlanningAssignment(PlanningBase):
+    id_talk: int
+
+
+class PlanningBatch(BaseModel):
+    assignments: List[PlanningAssignment] = Field(..., max_length=1000)
+
+
+# Affectation rejetée : talk invalide ou créneaux en conflit
+class BatchConflict(BaseModel):
+    index: int
+    id_talk: int
+    detail: str
+    conflits: List[int] = []
+
+
+class PlanningBatchResult(BaseModel):
+    planifies: List[PlanningAssignment]
+    conflits: List[BatchConflict]
+
+
+# Paramètres du solveur : grille de jours et d'heures à remplir
+class SolveRequest(BaseModel):
+    jours: List[date] = Field(..., min_length=1)
+    heure_debut: Optional[time] = None
+    heure_fin: Optional[time] = None
+    pas: int = Field(30, gt=0, le=240)
+    repartir_niveau: bool = True
+    repartir_sujet: bool = True
+
+
+# Proposition du solveur, directement réutilisable par POST /plannings/batch
+class SolvePreview(BaseModel):
+    assignments: List[PlanningAssignment]
+    non_places: List[int]
@@ -0,0 +1,31 @@
+from pydantic import BaseModel
+from datetime import date
+from typing import Dict, List
+from app.models.talk import Niveau, StatutTalk
+
+
+class OccupationSalle(BaseModel):
+    id_salle: int
+    nom_salle: str
+    capacite: int
+    sessions: int
+    minutes: int
+
+
+class OccupationJour(BaseModel):
+    jour: date
+    sessions: int
+    minutes: int
+
+
+# Compteurs et répartitions calculés côté base pour le tableau de bord
+class StatsOut(BaseModel):
+    utilisateurs: int
+    talks: int
+    plannings: int
+    salles: int
+    roles: int
+    talks_par_statut: Dict[StatutTalk, int]
+    talks_par_niveau: Dict[Niveau, int]
+    occupation_salles: List[OccupationSalle]
+    creneaux_par_jour: List[OccupationJour]
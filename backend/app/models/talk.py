@@ -1,6 +1,7 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from enum import Enum
-from typing import Optional
+from typing import List, Optional
+from app.core.config import settings
 from app.models.utilisateur import UtilisateurOut
 import datetime
 
@@ -22,7 +23,9 @@ class TalkCreate(BaseModel):
     titre: str
     sujet: str
     description: str
-    duree: int
+    # Bornée : la détection des chevauchements (app.core.schedule) ne remonte
+    # pas plus loin que SCHEDULE_MAX_TALK_DUREE
+    duree: int = Field(..., gt=0, le=settings.SCHEDULE_MAX_TALK_DUREE)
     niveau: Niveau
     statut: StatutTalk = StatutTalk.EN_ATTENTE
 
@@ -34,7 +37,7 @@ class TalkUpdate(BaseModel):
     titre: str
     sujet: str
     description: str
-    duree: int
+    duree: int = Field(..., gt=0, le=settings.SCHEDULE_MAX_TALK_DUREE)
     niveau: Niveau
 
     class Config:
@@ -56,3 +59,26 @@ class TalkOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+# Page de talks paginée par curseur
+class TalkPage(BaseModel):
+    items: List[TalkOut]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+
+
+# Ligne d'import en masse : le conférencier est l'importateur s'il est absent
+class TalkImport(TalkCreate):
+    id_conferencier: Optional[int] = None
+
+
+class ImportErreur(BaseModel):
+    ligne: int
+    erreur: str
+
+
+class ImportResult(BaseModel):
+    importes: int
+    rejetes: int
+    erreurs: List[ImportErreur]
@@ -0,0 +1,73 @@
+"""
+Lancement en production, depuis backend/ :
+    python -m app.server
+
+Plusieurs workers uvicorn (WEB_CONCURRENCY, un par cœur par défaut), uvloop
+et httptools s'ils sont installés, sans rechargement automatique. À l'arrêt
+(SIGTERM), chaque worker cesse d'accepter des connexions, laisse
+GRACEFUL_TIMEOUT secondes aux requêtes en cours puis exécute le lifespan
+(écriture des feedbacks en attente, déconnexion de Prisma).
+
+Avec plusieurs workers, les invalidations de cache (ETag, principaux, corps
+compressés) doivent passer d'un worker à l'autre : INVALIDATION_BACKEND vaut
+alors `file` par défaut, et le serveur refuse de démarrer s'il vaut
+explicitement `local`.
+"""
+
+import importlib.util
+import logging
+import os
+import uvicorn
+from app.core.config import settings
+
+logger = logging.getLogger("uvicorn.error")
+
+
+def _available(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def _shared_invalidation() -> None:
+    """
+    Impose un backend d'invalidation partagé entre les workers. Les workers
+    relisent la configuration dans l'environnement hérité de ce processus.
+    """
+    if settings.WEB_CONCURRENCY <= 1 or settings.INVALIDATION_BACKEND == "file":
+        return
+    if "INVALIDATION_BACKEND" in os.environ:
+        raise SystemExit(
+            f"INVALIDATION_BACKEND={settings.INVALIDATION_BACKEND} avec "
+            f"{settings.WEB_CONCURRENCY} workers : les autres workers ne verraient "
+            "pas les écritures. Utiliser INVALIDATION_BACKEND=file ou WEB_CONCURRENCY=1."
+        )
+    os.environ["INVALIDATION_BACKEND"] = "file"
+    logger.info(
+        "%d workers : invalidations partagées via %s",
+        settings.WEB_CONCURRENCY,
+        settings.INVALIDATION_DIR,
+    )
+
+
+def main() -> None:
+    _shared_invalidation()
+    loop = "uvloop" if _available("uvloop") else "asyncio"
+    http = "httptools" if _available("httptools") else "h11"
+    uvicorn.run(
+        "app.main:app",
+        host=settings.HOST,
+        port=settings.PORT,
+        workers=settings.WEB_CONCURRENCY,
+        loop=loop,
+        http=http,
+        backlog=settings.SERVER_BACKLOG,
+        timeout_keep_alive=settings.KEEPALIVE_TIMEOUT,
+        timeout_graceful_shutdown=settings.GRACEFUL_TIMEOUT,
+        limit_max_requests=settings.WORKER_MAX_REQUESTS or None,
+        access_log=settings.ACCESS_LOG,
+        proxy_headers=True,
+        server_header=False,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,452 @@
+"""
+Benchmark de charge de l'API (nécessite PostgreSQL).
+
+Remplit une base jetable (utilisateurs, salles, talks, plannings) puis envoie
+des requêtes concurrentes sur les routes principales : connexion, liste des
+talks, planning d'une semaine, planification d'un talk et planning filtré.
+Affiche le débit et les latences p50/p95/p99 de chaque scénario.
+
+Par défaut l'application tourne dans ce processus (transport ASGI de httpx,
+lifespan compris) ; avec `--url`, les requêtes visent un serveur déjà lancé
+(uvicorn avec ses workers) sur la même base.
+
+Le remplissage vide d'abord toutes les tables (TRUNCATE) : il faut le
+confirmer avec `--reset` ou BENCH_ALLOW_TRUNCATE=1, sinon rien n'est lancé.
+
+Usage, depuis backend/ et avec DATABASE_URL pointant vers une base jetable :
+    python -m benchmarks.bench_load --reset [--requetes 500] [--concurrence 20]
+    python -m benchmarks.bench_load --reset --save-baseline benchmarks/baseline.json
+    python -m benchmarks.bench_load --reset --baseline benchmarks/baseline.json
+
+Avec `--baseline`, le code de sortie vaut 1 si un scénario régresse au-delà
+de `--tolerance` (p95 plus lent ou débit plus faible) par rapport à la
+référence enregistrée sur la même machine.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from contextlib import AsyncExitStack
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+import httpx
+from app.core.invalidation import notify, start_invalidation, stop_invalidation
+from app.core.prisma import prisma
+from app.core.security import hash_password
+
+ROLES = ["CONFERENCIER", "ORGANISATEUR", "PUBLIC", "ADMINISTRATEUR"]
+NIVEAUX = ["DEBUTANT", "INTERMEDIAIRE", "AVANCE"]
+SUJETS = ["python", "web", "data", "devops", "ia", "securite", "mobile", "cloud"]
+MOT_DE_PASSE = "bench-password"
+ORIGINE = datetime(2025, 1, 6)
+# Créneaux de 30 minutes de 8 h à 20 h
+CRENEAUX = 24
+
+
+@dataclass
+class Donnees:
+    """
+    Ce que le jeu de données met à disposition des scénarios.
+    """
+
+    organisateurs: list[str]
+    salles: list[int]
+    jours: int
+    # Talks acceptés non planifiés : chacun ne peut être planifié qu'une fois
+    a_planifier: list[int]
+    tokens: list[str] = field(default_factory=list)
+
+
+def creneau(salles: list[int], rang: int, jour0: int) -> tuple[int, datetime]:
+    """
+    Créneau libre numéro `rang` : salles, puis heures, puis jours.
+    """
+    salle = salles[rang % len(salles)]
+    heure = (rang // len(salles)) % CRENEAUX
+    jour = jour0 + rang // (len(salles) * CRENEAUX)
+    return salle, ORIGINE + timedelta(days=jour, hours=8, minutes=30 * heure)
+
+
+async def seed(
+    rng: random.Random,
+    nb_utilisateurs: int,
+    nb_salles: int,
+    nb_talks: int,
+    nb_plannings: int,
+    nb_a_planifier: int,
+) -> Donnees:
+    await prisma.execute_raw(
+        'TRUNCATE "NoteTalk", "NoteConferencier", "Feedback", "Favori", '
+        '"Planning", "Talk", "Salle", "Utilisateur", "Role" '
+        "RESTART IDENTITY CASCADE"
+    )
+    # Identités remises à zéro : les rôles reçoivent les ids 1 à 4 attendus
+    for nom in ROLES:
+        await prisma.role.create(data={"nom_role": nom})
+
+    # Un seul hash pour tous : le coût bcrypt ne compte pas dans le remplissage
+    mot_de_passe = hash_password(MOT_DE_PASSE)
+    nb_organisateurs = max(1, nb_utilisateurs // 10)
+    nb_conferenciers = max(1, nb_utilisateurs * 4 // 10)
+    utilisateurs = []
+    for i in range(nb_utilisateurs):
+        if i < nb_organisateurs:
+            role = 2
+        elif i < nb_organisateurs + nb_conferenciers:
+            role = 1
+        else:
+            role = 3
+        utilisateurs.append(
+            {
+                "nom": f"bench {i}",
+                "email": f"bench{i}@example.com",
+                "mot_de_passe": mot_de_passe,
+                "id_role": role,
+            }
+        )
+    await prisma.utilisateur.create_many(data=utilisateurs)
+    organisateurs = [u["email"] for u in utilisateurs[:nb_organisateurs]]
+    conferenciers = range(nb_organisateurs + 1, nb_organisateurs + nb_conferenciers + 1)
+
+    await prisma.salle.create_many(
+        data=[
+            {"nom_salle": f"Salle {i}", "capacite": rng.randint(20, 400)}
+            for i in range(nb_salles)
+        ]
+    )
+    salles = [salle.id_salle for salle in await prisma.salle.find_many()]
+
+    # Talks 1..nb_plannings planifiés, puis ceux à planifier, puis le reste
+    talks = []
+    for i in range(nb_talks + nb_a_planifier):
+        if i < nb_plannings:
+            statut = "PLANIFIE"
+        elif i < nb_plannings + nb_a_planifier:
+            statut = "ACCEPTE"
+        else:
+            statut = rng.choice(["EN_ATTENTE", "ACCEPTE", "REFUSE"])
+        talks.append(
+            {
+                "titre": f"Talk {i}",
+                "description": "x" * rng.randint(200, 2000),
+                "duree": 30,
+                "niveau": rng.choice(NIVEAUX),
+                "sujet": rng.choice(SUJETS),
+                "statut": statut,
+                "id_conferencier": rng.choice(conferenciers),
+            }
+        )
+    await prisma.talk.create_many(data=talks)
+
+    plannings = []
+    for i in range(nb_plannings):
+        salle, date_heure = creneau(salles, i, 0)
+        plannings.append(
+            {
+                "id_talk": i + 1,
+                "id_salle": salle,
+                "id_organisateur": 1,
+                "date_heure": date_heure,
+            }
+        )
+    await prisma.planning.create_many(data=plannings)
+    jours = nb_plannings // (len(salles) * CRENEAUX) + 1
+
+    for table in ("Utilisateur", "Talk", "Planning"):
+        await prisma.execute_raw(f'ANALYZE "{table}"')
+
+    return Donnees(
+        organisateurs=organisateurs,
+        salles=salles,
+        jours=jours,
+        a_planifier=list(range(nb_plannings + 1, nb_plannings + nb_a_planifier + 1)),
+    )
+
+
+# --- Scénarios ---------------------------------------------------------------
+
+Scenario = Callable[[httpx.AsyncClient, Donnees, int], Awaitable[httpx.Response]]
+
+
+def _auth(donnees: Donnees, i: int) -> dict:
+    return {"Authorization": f"Bearer {donnees.tokens[i % len(donnees.tokens)]}"}
+
+
+async def login(client: httpx.AsyncClient, donnees: Donnees, i: int):
+    email = donnees.organisateurs[i % len(donnees.organisateurs)]
+    return await client.post(
+        "/api/auth/token", data={"username": email, "password": MOT_DE_PASSE}
+    )
+
+
+async def list_talks(client: httpx.AsyncClient, donnees: Donnees, i: int):
+    return await client.get(
+        "/api/talks/",
+        params={"skip": (i * 20) % 1000, "limit": 20},
+        headers=_auth(donnees, i),
+    )
+
+
+async def get_planning(client: httpx.AsyncClient, donnees: Donnees, i: int):
+    debut = ORIGINE + timedelta(days=i % donnees.jours)
+    return await client.get(
+        "/api/plannings/",
+        params={
+            "from": debut.isoformat(),
+            "to": (debut + timedelta(days=7)).isoformat(),
+        },
+    )
+
+
+async def schedule_talk(client: httpx.AsyncClient, donnees: Donnees, i: int):
+    # Un talk accepté différent à chaque requête, placé après les jours remplis
+    salle, date_heure = creneau(donnees.salles, i, donnees.jours)
+    return await client.patch(
+        f"/api/talks/{donnees.a_planifier[i]}/schedule",
+        params={
+            "id_salle": salle,
+            "date": date_heure.strftime("%Y-%m-%d"),
+            "heure": date_heure.strftime("%H:%M"),
+        },
+        headers=_auth(donnees, i),
+    )
+
+
+async def get_filtered_planning(client: httpx.AsyncClient, donnees: Donnees, i: int):
+    params = {"jour": (ORIGINE + timedelta(days=i % donnees.jours)).date().isoformat()}
+    if i % 2:
+        params["salle"] = donnees.salles[i % len(donnees.salles)]
+    if i % 3 == 0:
+        params["sujet"] = SUJETS[i % len(SUJETS)][:3]
+    return await client.get(
+        "/api/plannings/planning", params=params, headers=_auth(donnees, i)
+    )
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "login": login,
+    "list_talks": list_talks,
+    "get_planning": get_planning,
+    "schedule_talk": schedule_talk,
+    "get_filtered_planning": get_filtered_planning,
+}
+
+
+# --- Mesure ------------------------------------------------------------------
+
+
+@dataclass
+class Resultat:
+    requetes: int
+    erreurs: int
+    debit: float
+    p50: float
+    p95: float
+    p99: float
+
+
+async def run(
+    client: httpx.AsyncClient,
+    donnees: Donnees,
+    scenario: Scenario,
+    requetes: int,
+    concurrence: int,
+    decalage: int = 0,
+) -> Resultat:
+    """
+    `requetes` appels de `scenario` par `concurrence` tâches ; `decalage`
+    sépare les numéros de requête de l'échauffement de ceux de la mesure.
+    """
+    suivante = iter(range(decalage, decalage + requetes))
+    durees: list[float] = []
+    erreurs = 0
+
+    async def worker():
+        nonlocal erreurs
+        for i in suivante:
+            start = time.perf_counter()
+            response = await scenario(client, donnees, i)
+            durees.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                erreurs += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrence)))
+    total = time.perf_counter() - start
+
+    centiles = statistics.quantiles(durees, n=100, method="inclusive")
+    return Resultat(
+        requetes=requetes,
+        erreurs=erreurs,
+        debit=requetes / total,
+        p50=centiles[49],
+        p95=centiles[94],
+        p99=centiles[98],
+    )
+
+
+def compare(
+    resultats: dict[str, Resultat], reference: dict, tolerance: float
+) -> list[str]:
+    regressions = []
+    for nom, resultat in resultats.items():
+        base = reference.get("scenarios", {}).get(nom)
+        if base is None:
+            continue
+        if resultat.p95 > base["p95"] * (1 + tolerance):
+            regressions.append(
+                f"{nom} : p95 {resultat.p95:.1f} ms (référence {base['p95']:.1f} ms)"
+            )
+        if resultat.debit < base["debit"] * (1 - tolerance):
+            regressions.append(
+                f"{nom} : {resultat.debit:.0f} req/s (référence {base['debit']:.0f})"
+            )
+        if resultat.erreurs > base["erreurs"]:
+            regressions.append(
+                f"{nom} : {resultat.erreurs} erreurs (référence {base['erreurs']})"
+            )
+    return regressions
+
+
+async def main(args) -> int:
+    scenarios = args.scenarios or list(SCENARIOS)
+    rng = random.Random(args.seed)
+
+    async with AsyncExitStack() as stack:
+        if args.url:
+            await prisma.connect()
+            stack.push_async_callback(prisma.disconnect)
+            # Pour que les workers du serveur oublient leurs caches après le
+            # remplissage (même backend d'invalidation que le serveur)
+            await start_invalidation()
+            stack.push_async_callback(stop_invalidation)
+            transport = None
+        else:
+            from app.main import app
+
+            # Démarrage complet (connexion, tâches de fond), comme sous uvicorn
+            await stack.enter_async_context(app.router.lifespan_context(app))
+            transport = httpx.ASGITransport(app=app)
+
+        donnees = await seed(
+            rng,
+            args.utilisateurs,
+            args.salles,
+            args.talks,
+            args.plannings,
+            args.requetes + args.echauffement,
+        )
+        notify("talks", "plannings", "salles", "roles", "favoris", "feedbacks")
+        client = await stack.enter_async_context(
+            httpx.AsyncClient(
+                transport=transport,
+                base_url=args.url or "http://bench",
+                timeout=60,
+            )
+        )
+        for email in donnees.organisateurs[:10]:
+            response = await client.post(
+                "/api/auth/token", data={"username": email, "password": MOT_DE_PASSE}
+            )
+            response.raise_for_status()
+            donnees.tokens.append(response.json()["access_token"])
+
+        print(
+            f"{args.utilisateurs} utilisateurs, {args.salles} salles, "
+            f"{args.talks} talks, {args.plannings} plannings ; "
+            f"{args.requetes} requêtes par scénario, concurrence {args.concurrence}"
+        )
+        print(
+            f"{'scénario':<22} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} "
+            f"{'p99 ms':>8} {'erreurs':>8}"
+        )
+        resultats = {}
+        for nom in scenarios:
+            scenario = SCENARIOS[nom]
+            for i in range(args.echauffement):
+                await scenario(client, donnees, i)
+            resultat = await run(
+                client,
+                donnees,
+                scenario,
+                args.requetes,
+                args.concurrence,
+                decalage=args.echauffement,
+            )
+            resultats[nom] = resultat
+            print(
+                f"{nom:<22} {resultat.debit:>8.0f} {resultat.p50:>8.1f} "
+                f"{resultat.p95:>8.1f} {resultat.p99:>8.1f} {resultat.erreurs:>8}"
+            )
+
+    if args.save_baseline:
+        Path(args.save_baseline).write_text(
+            json.dumps(
+                {
+                    "parametres": {
+                        k: v
+                        for k, v in vars(args).items()
+                        if k not in ("baseline", "save_baseline")
+                    },
+                    "scenarios": {nom: asdict(r) for nom, r in resultats.items()},
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+        print(f"Référence enregistrée dans {args.save_baseline}")
+
+    if args.baseline:
+        reference = json.loads(Path(args.baseline).read_text())
+        regressions = compare(resultats, reference, args.tolerance)
+        for regression in regressions:
+            print(f"RÉGRESSION {regression}")
+        if regressions:
+            return 1
+        print(f"Aucune régression (tolérance {args.tolerance:.0%})")
+    return 0
+
+
+def parse_args(argv: Optional[list[str]] = None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", help="serveur déjà lancé, sinon ASGI en processus")
+    parser.add_argument("--utilisateurs", type=int, default=1000)
+    parser.add_argument("--salles", type=int, default=20)
+    parser.add_argument("--talks", type=int, default=5000)
+    parser.add_argument("--plannings", type=int, default=3000)
+    parser.add_argument("--requetes", type=int, default=500)
+    parser.add_argument("--concurrence", type=int, default=20)
+    parser.add_argument("--echauffement", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS))
+    parser.add_argument("--baseline", help="référence JSON à comparer")
+    parser.add_argument("--save-baseline", help="enregistre les résultats ici")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument(
+        "--reset",
+        action="store_true",
+        default=os.getenv("BENCH_ALLOW_TRUNCATE") == "1",
+        help="autorise le vidage de toutes les tables de DATABASE_URL",
+    )
+    args = parser.parse_args(argv)
+    if not args.reset:
+        parser.error(
+            "le remplissage vide toutes les tables de DATABASE_URL : "
+            "confirmer avec --reset (ou BENCH_ALLOW_TRUNCATE=1)"
+        )
+    if args.requetes < 2:
+        parser.error("--requetes doit valoir au moins 2")
+    if args.plannings > args.talks:
+        parser.error("--plannings ne peut pas dépasser --talks")
+    return args
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
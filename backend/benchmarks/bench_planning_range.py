@@ -0,0 +1,130 @@
+"""
+Benchmark de GET /api/plannings?from=&to= (nécessite PostgreSQL).
+
+Remplit une base de test avec un historique croissant de plannings et mesure
+la lecture d'une semaine : la latence doit rester stable quelle que soit la
+taille de l'historique.
+
+Usage, depuis backend/ et avec DATABASE_URL pointant vers une base jetable :
+    python -m benchmarks.bench_planning_range [--tailles 5000 20000 50000]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from app.api.routes.plannings import _stream_planning_range
+from app.core.prisma import prisma
+
+NIVEAUX = ["DEBUTANT", "INTERMEDIAIRE", "AVANCE"]
+NB_SALLES = 30
+# Talks par jour : la semaine mesurée reste de taille constante
+PAR_JOUR = 60
+
+
+async def reset() -> tuple[int, list[int]]:
+    for table in ("Planning", "Feedback", "Favori", "Talk", "Salle", "Utilisateur"):
+        await prisma.execute_raw(f'TRUNCATE "{table}" RESTART IDENTITY CASCADE')
+    role = await prisma.role.find_first(where={"id_role": 2})
+    if role is None:
+        role = await prisma.role.create(data={"nom_role": "ORGANISATEUR"})
+    organisateur = await prisma.utilisateur.create(
+        data={
+            "nom": "bench",
+            "email": "bench@example.com",
+            "mot_de_passe": "x",
+            "id_role": role.id_role,
+        }
+    )
+    await prisma.salle.create_many(
+        data=[{"nom_salle": f"Salle {i}", "capacite": 100} for i in range(NB_SALLES)]
+    )
+    salles = [salle.id_salle for salle in await prisma.salle.find_many()]
+    return organisateur.id_utilisateur, salles
+
+
+async def seed(
+    rng: random.Random,
+    organisateur: int,
+    salles: list[int],
+    debut: datetime,
+    nombre: int,
+    offset: int,
+) -> None:
+    """
+    Ajoute `nombre` talks planifiés, répartis à partir de `debut`.
+    """
+    await prisma.talk.create_many(
+        data=[
+            {
+                "titre": f"Talk {offset + i}",
+                "description": "x" * 2000,
+                "duree": 30,
+                "niveau": rng.choice(NIVEAUX),
+                "sujet": "bench",
+                "statut": "PLANIFIE",
+                "id_conferencier": organisateur,
+            }
+            for i in range(nombre)
+        ]
+    )
+    # Identités remises à zéro par reset() : les nouveaux talks suivent `offset`
+    talks = await prisma.talk.find_many(
+        where={"id_talk": {"gt": offset}}, order={"id_talk": "asc"}
+    )
+    await prisma.planning.create_many(
+        data=[
+            {
+                "id_talk": talk.id_talk,
+                "id_salle": salles[i % len(salles)],
+                "id_organisateur": organisateur,
+                "date_heure": debut
+                + timedelta(days=(offset + i) // PAR_JOUR, minutes=(i % 24) * 30),
+            }
+            for i, talk in enumerate(talks)
+        ]
+    )
+
+
+async def measure(debut: datetime, fin: datetime, iterations: int) -> list[float]:
+    durees = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        taille = 0
+        async for chunk in _stream_planning_range(debut, fin, None, False):
+            taille += len(chunk)
+        durees.append((time.perf_counter() - start) * 1000)
+    return durees
+
+
+async def main(tailles: list[int], iterations: int) -> None:
+    rng = random.Random(42)
+    await prisma.connect()
+    try:
+        organisateur, salles = await reset()
+        origine = datetime(2025, 1, 6)
+        # Semaine lue : toujours la première, l'historique grossit après
+        semaine = (origine, origine + timedelta(days=7))
+        total = 0
+        for taille in sorted(tailles):
+            await seed(rng, organisateur, salles, origine, taille - total, total)
+            total = taille
+            await prisma.execute_raw('ANALYZE "Planning"')
+            durees = sorted(await measure(*semaine, iterations))
+            p95 = durees[int(len(durees) * 0.95) - 1]
+            print(
+                f"{total:>7} plannings : p50 {statistics.median(durees):6.1f} ms"
+                f"  p95 {p95:6.1f} ms  ({PAR_JOUR * 7} lignes lues)"
+            )
+    finally:
+        await prisma.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tailles", type=int, nargs="+", default=[5000, 20000, 50000])
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.tailles, args.iterations))
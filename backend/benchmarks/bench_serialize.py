@@ -0,0 +1,199 @@
+"""
+Benchmark de la sérialisation des listes (sans base de données).
+
+Compare, pour une liste de talks et une liste de plannings, l'ancien chemin
+(objets TalkOut / PlanningOut validés puis encodés par FastAPI via
+`response_model`) et le chemin direct (`talk_row` / `planning_row` puis
+`FastJSONResponse`). Les requêtes passent par une vraie application FastAPI,
+appelée en ASGI dans ce processus ; seul le temps CPU est mesuré, et les
+deux réponses doivent être identiques une fois décodées.
+
+Usage, depuis backend/ :
+    python -m benchmarks.bench_serialize [--lignes 1000] [--repetitions 50]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import List
+from fastapi import FastAPI
+from app.core import serialize
+from app.core.serialize import FastJSONResponse, planning_row, talk_row
+from app.models.planning import PlanningOut
+from app.models.talk import Niveau, StatutTalk, TalkOut
+
+SUJETS = ["python", "web", "data", "devops", "ia", "securite", "mobile", "cloud"]
+
+
+def generate(lignes: int, seed: int = 42):
+    """
+    Objets de même forme que les modèles Prisma (talk avec conferencier et
+    planning, planning avec talk et salle).
+    """
+    rng = random.Random(seed)
+    conferenciers = [
+        SimpleNamespace(
+            id_utilisateur=i,
+            nom=f"Conférencier {i}",
+            email=f"conf{i}@example.com",
+            mot_de_passe="$2b$12$" + "x" * 53,
+            id_role=1,
+        )
+        for i in range(1, 51)
+    ]
+    salles = [SimpleNamespace(id_salle=i, nom_salle=f"Salle {i}") for i in range(20)]
+    talks, plannings = [], []
+    for i in range(1, lignes + 1):
+        conferencier = rng.choice(conferenciers)
+        talk = SimpleNamespace(
+            id_talk=i,
+            titre=f"Talk {i}",
+            sujet=rng.choice(SUJETS),
+            description="Une description assez longue. " * rng.randint(5, 60),
+            duree=rng.choice([30, 45, 60]),
+            niveau=rng.choice(list(Niveau)),
+            statut=StatutTalk.PLANIFIE,
+            id_conferencier=conferencier.id_utilisateur,
+            conferencier=conferencier,
+            planning=None,
+        )
+        salle = salles[i % len(salles)]
+        planning = SimpleNamespace(
+            id_planning=i,
+            id_talk=i,
+            id_salle=salle.id_salle,
+            date_heure=datetime(2025, 6, 2, 8) + timedelta(minutes=30 * (i // 20)),
+            talk=talk,
+            salle=salle,
+        )
+        talk.planning = planning
+        talks.append(talk)
+        plannings.append(planning)
+    return talks, plannings
+
+
+# Chemins d'origine : objets pydantic construits à la main puis revalidés
+def talk_out(talk) -> TalkOut:
+    return TalkOut(
+        id_talk=talk.id_talk,
+        titre=talk.titre,
+        sujet=talk.sujet,
+        description=talk.description,
+        duree=talk.duree,
+        niveau=talk.niveau,
+        statut=talk.statut,
+        id_conferencier=talk.id_conferencier,
+        conferencier=talk.conferencier,
+        date=talk.planning.date_heure.date() if talk.planning else None,
+        heure=talk.planning.date_heure.time() if talk.planning else None,
+    )
+
+
+def planning_out(planning) -> PlanningOut:
+    return PlanningOut(
+        id_planning=planning.id_planning,
+        talk_id=planning.talk.id_talk,
+        talk_titre=planning.talk.titre,
+        talk_description=planning.talk.description,
+        talk_statut=planning.talk.statut,
+        talk_duree=planning.talk.duree,
+        salle_nom=planning.salle.nom_salle,
+        date=planning.date_heure.date().isoformat(),
+        heure=planning.date_heure.time().strftime("%H:%M"),
+        salle_id=planning.id_salle,
+    )
+
+
+def build_app(talks, plannings) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/avant/talks", response_model=List[TalkOut])
+    async def talks_avant():
+        return [talk_out(talk) for talk in talks]
+
+    @app.get("/apres/talks", response_model=List[TalkOut])
+    async def talks_apres():
+        return FastJSONResponse([talk_row(talk) for talk in talks])
+
+    @app.get("/avant/plannings", response_model=List[PlanningOut])
+    async def plannings_avant():
+        return [planning_out(planning) for planning in plannings]
+
+    @app.get("/apres/plannings", response_model=List[PlanningOut])
+    async def plannings_apres():
+        return FastJSONResponse([planning_row(planning) for planning in plannings])
+
+    return app
+
+
+async def call(app: FastAPI, path: str) -> bytes:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [],
+        "server": ("bench", 80),
+        "client": ("bench", 1234),
+    }
+    body = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(body)
+
+
+async def measure(app: FastAPI, path: str, repetitions: int) -> list[float]:
+    durees = []
+    for _ in range(repetitions):
+        start = time.process_time()
+        await call(app, path)
+        durees.append((time.process_time() - start) * 1000)
+    return durees
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lignes", type=int, default=1000)
+    parser.add_argument("--repetitions", type=int, default=50)
+    args = parser.parse_args()
+
+    app = build_app(*generate(args.lignes))
+    encodeur = "orjson" if serialize.orjson is not None else "json"
+    print(f"{args.lignes} lignes, {args.repetitions} requêtes, encodeur {encodeur}")
+    for liste in ("talks", "plannings"):
+        avant = await call(app, f"/avant/{liste}")
+        apres = await call(app, f"/apres/{liste}")
+        assert json.loads(avant) == json.loads(apres), f"{liste} : réponses différentes"
+
+        durees_avant = await measure(app, f"/avant/{liste}", args.repetitions)
+        durees_apres = await measure(app, f"/apres/{liste}", args.repetitions)
+        mediane_avant = statistics.median(durees_avant)
+        mediane_apres = statistics.median(durees_apres)
+        print(
+            f"{liste:<10} CPU par requête : avant {mediane_avant:6.1f} ms, "
+            f"après {mediane_apres:6.1f} ms (x{mediane_avant / mediane_apres:.1f}), "
+            f"{len(apres) // 1024} Ko"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,83 @@
+"""
+Benchmark du solveur de planning (sans base de données).
+
+Usage, depuis backend/ :
+    python -m benchmarks.bench_solver [--talks 2000] [--salles 30] [--jours 6]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from datetime import time as heure
+from app.core.solver import Grille, SalleASolver, TalkASolver, solve
+
+NIVEAUX = ["DEBUTANT", "INTERMEDIAIRE", "AVANCE"]
+SUJETS = ["python", "web", "data", "devops", "ia", "securite", "mobile", "cloud"]
+
+
+def generate(nb_talks: int, nb_salles: int, seed: int = 42):
+    rng = random.Random(seed)
+    talks = [
+        TalkASolver(
+            id_talk=i,
+            duree=rng.choice([30, 45, 60, 90]),
+            niveau=rng.choice(NIVEAUX),
+            sujet=rng.choice(SUJETS),
+        )
+        for i in range(nb_talks)
+    ]
+    salles = [SalleASolver(i, rng.randint(20, 400)) for i in range(nb_salles)]
+    return talks, salles
+
+
+def check_no_overlap(affectations, talks) -> None:
+    durees = {talk.id_talk: talk.duree for talk in talks}
+    par_salle = defaultdict(list)
+    for a in affectations:
+        fin = a.date_heure + timedelta(minutes=durees[a.id_talk])
+        par_salle[a.id_salle].append((a.date_heure, fin))
+    for creneaux in par_salle.values():
+        creneaux.sort()
+        for (_, fin), (debut, _) in zip(creneaux, creneaux[1:]):
+            assert debut >= fin, "chevauchement détecté"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--talks", type=int, default=2000)
+    parser.add_argument("--salles", type=int, default=30)
+    parser.add_argument("--jours", type=int, default=6)
+    parser.add_argument("--repetitions", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    talks, salles = generate(args.talks, args.salles)
+    grille = Grille(
+        jours=tuple(date(2025, 6, 1) + timedelta(days=d) for d in range(args.jours)),
+        debut=heure(8, 0),
+        fin=heure(20, 0),
+        pas=15,
+    )
+
+    durees = []
+    for _ in range(args.repetitions):
+        debut = time.perf_counter()
+        affectations, non_places = solve(talks, salles, grille)
+        durees.append(time.perf_counter() - debut)
+    check_no_overlap(affectations, talks)
+
+    mediane = statistics.median(durees)
+    print(
+        f"{args.talks} talks x {args.salles} salles x {args.jours} jours : "
+        f"{len(affectations)} placés, {len(non_places)} non placés, "
+        f"médiane {mediane * 1000:.0f} ms, max {max(durees) * 1000:.0f} ms"
+    )
+    return 0 if mediane <= args.max_seconds else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,2 @@
+-- CreateIndex
+CREATE INDEX "Planning_date_heure_idx" ON "Planning"("date_heure");
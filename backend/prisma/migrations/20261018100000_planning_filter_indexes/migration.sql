@@ -0,0 +1,11 @@
+-- CreateExtension
+CREATE EXTENSION IF NOT EXISTS "pg_trgm";
+
+-- CreateIndex
+CREATE INDEX "Planning_id_salle_date_heure_idx" ON "Planning"("id_salle", "date_heure");
+
+-- CreateIndex
+CREATE INDEX "Talk_statut_niveau_idx" ON "Talk"("statut", "niveau");
+
+-- CreateIndex
+CREATE INDEX "Talk_sujet_idx" ON "Talk" USING GIN ("sujet" gin_trgm_ops);
@@ -0,0 +1,8 @@
+-- CreateIndex
+-- Index d'expression pour GET /talks/search : l'expression doit rester
+-- identique à TALK_DOCUMENT (app/core/search.py).
+CREATE INDEX "Talk_recherche_idx" ON "Talk" USING GIN ((
+    setweight(to_tsvector('french', coalesce("titre", '')), 'A') ||
+    setweight(to_tsvector('french', coalesce("sujet", '')), 'B') ||
+    setweight(to_tsvector('french', coalesce("description", '')), 'C')
+));
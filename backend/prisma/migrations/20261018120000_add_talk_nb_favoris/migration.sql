@@ -0,0 +1,10 @@
+-- AlterTable
+ALTER TABLE "Talk" ADD COLUMN "nb_favoris" INTEGER NOT NULL DEFAULT 0;
+
+-- Backfill
+UPDATE "Talk" t SET "nb_favoris" = f.total
+FROM (SELECT "id_talk", count(*) AS total FROM "Favori" GROUP BY "id_talk") f
+WHERE f."id_talk" = t."id_talk";
+
+-- CreateIndex
+CREATE INDEX "Talk_nb_favoris_id_talk_idx" ON "Talk"("nb_favoris" DESC, "id_talk");
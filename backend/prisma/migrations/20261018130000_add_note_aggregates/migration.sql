@@ -0,0 +1,49 @@
+-- CreateTable
+CREATE TABLE "NoteTalk" (
+    "id_talk" INTEGER NOT NULL,
+    "nb" INTEGER NOT NULL DEFAULT 0,
+    "somme" INTEGER NOT NULL DEFAULT 0,
+    "note_1" INTEGER NOT NULL DEFAULT 0,
+    "note_2" INTEGER NOT NULL DEFAULT 0,
+    "note_3" INTEGER NOT NULL DEFAULT 0,
+    "note_4" INTEGER NOT NULL DEFAULT 0,
+    "note_5" INTEGER NOT NULL DEFAULT 0,
+
+    CONSTRAINT "NoteTalk_pkey" PRIMARY KEY ("id_talk")
+);
+
+-- CreateTable
+CREATE TABLE "NoteConferencier" (
+    "id_conferencier" INTEGER NOT NULL,
+    "nb" INTEGER NOT NULL DEFAULT 0,
+    "somme" INTEGER NOT NULL DEFAULT 0,
+    "note_1" INTEGER NOT NULL DEFAULT 0,
+    "note_2" INTEGER NOT NULL DEFAULT 0,
+    "note_3" INTEGER NOT NULL DEFAULT 0,
+    "note_4" INTEGER NOT NULL DEFAULT 0,
+    "note_5" INTEGER NOT NULL DEFAULT 0,
+
+    CONSTRAINT "NoteConferencier_pkey" PRIMARY KEY ("id_conferencier")
+);
+
+-- AddForeignKey
+ALTER TABLE "NoteTalk" ADD CONSTRAINT "NoteTalk_id_talk_fkey" FOREIGN KEY ("id_talk") REFERENCES "Talk"("id_talk") ON DELETE RESTRICT ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE "NoteConferencier" ADD CONSTRAINT "NoteConferencier_id_conferencier_fkey" FOREIGN KEY ("id_conferencier") REFERENCES "Utilisateur"("id_utilisateur") ON DELETE RESTRICT ON UPDATE CASCADE;
+
+-- Backfill
+INSERT INTO "NoteTalk" ("id_talk", "nb", "somme", "note_1", "note_2", "note_3", "note_4", "note_5")
+SELECT "id_talk", count(*), sum("note"),
+       count(*) FILTER (WHERE "note" = 1), count(*) FILTER (WHERE "note" = 2),
+       count(*) FILTER (WHERE "note" = 3), count(*) FILTER (WHERE "note" = 4),
+       count(*) FILTER (WHERE "note" = 5)
+FROM "Feedback" GROUP BY "id_talk";
+
+INSERT INTO "NoteConferencier" ("id_conferencier", "nb", "somme", "note_1", "note_2", "note_3", "note_4", "note_5")
+SELECT t."id_conferencier", count(*), sum(f."note"),
+       count(*) FILTER (WHERE f."note" = 1), count(*) FILTER (WHERE f."note" = 2),
+       count(*) FILTER (WHERE f."note" = 3), count(*) FILTER (WHERE f."note" = 4),
+       count(*) FILTER (WHERE f."note" = 5)
+FROM "Feedback" f JOIN "Talk" t ON t."id_talk" = f."id_talk"
+GROUP BY t."id_conferencier";
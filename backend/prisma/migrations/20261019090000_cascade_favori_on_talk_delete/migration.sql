@@ -0,0 +1,5 @@
+-- DropForeignKey
+ALTER TABLE "Favori" DROP CONSTRAINT "Favori_id_talk_fkey";
+
+-- AddForeignKey
+ALTER TABLE "Favori" ADD CONSTRAINT "Favori_id_talk_fkey" FOREIGN KEY ("id_talk") REFERENCES "Talk"("id_talk") ON DELETE CASCADE ON UPDATE CASCADE;
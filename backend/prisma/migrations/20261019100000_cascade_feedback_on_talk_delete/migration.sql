@@ -0,0 +1,11 @@
+-- DropForeignKey
+ALTER TABLE "Feedback" DROP CONSTRAINT "Feedback_id_talk_fkey";
+
+-- DropForeignKey
+ALTER TABLE "NoteTalk" DROP CONSTRAINT "NoteTalk_id_talk_fkey";
+
+-- AddForeignKey
+ALTER TABLE "Feedback" ADD CONSTRAINT "Feedback_id_talk_fkey" FOREIGN KEY ("id_talk") REFERENCES "Talk"("id_talk") ON DELETE CASCADE ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE "NoteTalk" ADD CONSTRAINT "NoteTalk_id_talk_fkey" FOREIGN KEY ("id_talk") REFERENCES "Talk"("id_talk") ON DELETE CASCADE ON UPDATE CASCADE;
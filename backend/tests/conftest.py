@@ -0,0 +1,131 @@
+"""
+Fixtures communes.
+
+Les tests qui utilisent `client` tournent sur une base PostgreSQL dédiée,
+migrée au préalable et vidée à chaque test (`donnees`) :
+
+    TEST_DATABASE_URL=postgresql://... prisma migrate deploy
+    TEST_DATABASE_URL=postgresql://... python -m pytest
+
+Sans TEST_DATABASE_URL, ils sont ignorés.
+"""
+
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import pytest
+from fastapi.testclient import TestClient
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+if TEST_DATABASE_URL:
+    # Avant tout import de l'application : le client Prisma lit l'URL au chargement
+    os.environ["DATABASE_URL"] = TEST_DATABASE_URL
+
+from app.core.prisma import prisma  # noqa: E402
+from app.core.querylog import assert_max_queries  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+
+JOUR = datetime(2025, 6, 2, 8)
+NB_PLANIFIES = 20
+
+
+@dataclass
+class Donnees:
+    organisateur: dict
+    salles: list[int]
+    talk_accepte: int
+
+
+async def _seed() -> Donnees:
+    await prisma.execute_raw(
+        'TRUNCATE "NoteTalk", "NoteConferencier", "Feedback", "Favori", '
+        '"Planning", "Talk", "Salle", "Utilisateur", "Role" '
+        "RESTART IDENTITY CASCADE"
+    )
+    # Identités remises à zéro : les rôles reçoivent les ids 1 à 4 attendus
+    for nom in ("CONFERENCIER", "ORGANISATEUR", "PUBLIC", "ADMINISTRATEUR"):
+        await prisma.role.create(data={"nom_role": nom})
+
+    organisateur = await prisma.utilisateur.create(
+        data={
+            "nom": "Organisateur",
+            "email": "orga@example.com",
+            "mot_de_passe": "x",
+            "id_role": 2,
+        }
+    )
+    conferencier = await prisma.utilisateur.create(
+        data={
+            "nom": "Conférencier",
+            "email": "conf@example.com",
+            "mot_de_passe": "x",
+            "id_role": 1,
+        }
+    )
+    await prisma.salle.create_many(
+        data=[{"nom_salle": f"Salle {i}", "capacite": 100} for i in range(2)]
+    )
+    salles = [salle.id_salle for salle in await prisma.salle.find_many()]
+
+    # Talks 1..NB_PLANIFIES planifiés, le suivant accepté et à planifier
+    await prisma.talk.create_many(
+        data=[
+            {
+                "titre": f"Talk {i}",
+                "description": "Description",
+                "duree": 30,
+                "niveau": "DEBUTANT",
+                "sujet": "python",
+                "statut": "PLANIFIE" if i < NB_PLANIFIES else "ACCEPTE",
+                "id_conferencier": conferencier.id_utilisateur,
+            }
+            for i in range(NB_PLANIFIES + 1)
+        ]
+    )
+    await prisma.planning.create_many(
+        data=[
+            {
+                "id_talk": i + 1,
+                "id_salle": salles[i % len(salles)],
+                "date_heure": JOUR + timedelta(minutes=30 * (i // len(salles))),
+                "id_organisateur": organisateur.id_utilisateur,
+            }
+            for i in range(NB_PLANIFIES)
+        ]
+    )
+
+    token = create_access_token(
+        data={"sub": str(organisateur.id_utilisateur)}, utilisateur=organisateur
+    )
+    return Donnees(
+        organisateur={"Authorization": f"Bearer {token}"},
+        salles=salles,
+        talk_accepte=NB_PLANIFIES + 1,
+    )
+
+
+@pytest.fixture(scope="session")
+def client():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL non défini")
+    from app.main import app
+
+    # Le cycle de vie (connexion Prisma, bus d'invalidation) tourne une fois
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def donnees(client) -> Donnees:
+    """
+    Jeu de données minimal, réinséré dans la boucle de l'application.
+    """
+    return client.portal.call(_seed)
+
+
+@pytest.fixture
+def query_budget():
+    """
+    `with query_budget(n): ...` échoue au-delà de n requêtes Prisma.
+    """
+    return assert_max_queries
@@ -0,0 +1,27 @@
+"""
+Cache de réponses invalidé par sujet (sans base de données).
+"""
+
+import asyncio
+from app.core.cache import ReadThroughCache
+from app.core.invalidation import notify
+
+
+def test_load_racing_a_write_is_not_kept():
+    cache = ReadThroughCache(ttl=60, topics=("test_cache",))
+    chargements = []
+
+    async def loader() -> bytes:
+        chargements.append(1)
+        if len(chargements) == 1:
+            # Écriture pendant la lecture en base
+            notify("test_cache")
+        return b"v%d" % len(chargements)
+
+    async def scenario():
+        assert await cache.get("cle", loader) == b"v1"
+        assert await cache.get("cle", loader) == b"v2"
+        assert await cache.get("cle", loader) == b"v2"
+
+    asyncio.run(scenario())
+    assert len(chargements) == 2
@@ -0,0 +1,64 @@
+"""
+Compression et validateurs HTTP (sans base de données).
+"""
+
+import httpx
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+from app.core.http_cache import conditional_get
+from app.core.middleware import CompressionMiddleware
+
+
+def _client(taille: int) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/liste")
+    async def liste(request: Request, response: Response):
+        not_modified = conditional_get(request, response, "test_compression")
+        if not_modified:
+            return not_modified
+        return ["x" * taille]
+
+    app.add_middleware(
+        CompressionMiddleware, minimum_size=1024, content_types=["application/json"]
+    )
+    return TestClient(app)
+
+
+def _revalidate(
+    client: TestClient, encoding: str
+) -> tuple[httpx.Response, httpx.Response]:
+    headers = {"Accept-Encoding": encoding}
+    ok = client.get("/liste", headers=headers)
+    not_modified = client.get(
+        "/liste", headers={**headers, "If-None-Match": ok.headers["etag"]}
+    )
+    return ok, not_modified
+
+
+def test_304_repeats_validators_of_compressed_200():
+    ok, not_modified = _revalidate(_client(4096), "gzip")
+
+    assert ok.headers["content-encoding"] == "gzip"
+    assert ok.headers["etag"].startswith("W/")
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == ok.headers["etag"]
+    assert not_modified.headers["vary"] == ok.headers["vary"] == "Accept-Encoding"
+
+
+def test_304_repeats_validators_below_minimum_size():
+    ok, not_modified = _revalidate(_client(10), "gzip")
+
+    assert "content-encoding" not in ok.headers
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == ok.headers["etag"]
+    assert not_modified.headers["vary"] == ok.headers["vary"]
+
+
+def test_identity_keeps_strong_etag():
+    ok, not_modified = _revalidate(_client(4096), "identity")
+
+    assert not ok.headers["etag"].startswith("W/")
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == ok.headers["etag"]
+    assert not_modified.headers["vary"] == "Accept-Encoding"
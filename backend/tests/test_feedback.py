@@ -0,0 +1,58 @@
+"""
+Tampon des feedbacks. Les tests d'écriture nécessitent TEST_DATABASE_URL
+(voir conftest.py).
+"""
+
+import asyncio
+from datetime import datetime
+from app.core.feedback import FeedbackBuffer, FeedbackEnAttente
+from app.core.prisma import prisma
+
+
+def _feedback(id_utilisateur: int, id_talk: int, note: int = 4) -> FeedbackEnAttente:
+    return FeedbackEnAttente(id_utilisateur, id_talk, note, "", datetime(2025, 6, 2))
+
+
+def test_discard_talk_drops_only_that_talk():
+    buffer = FeedbackBuffer(batch_size=100, interval=1, max_pending=100)
+    for id_utilisateur in (1, 2):
+        for id_talk in (10, 11):
+            buffer.submit(_feedback(id_utilisateur, id_talk))
+
+    assert buffer.discard_talk(10) == 2
+    assert buffer.discard_talk(10) == 0
+    assert sorted(buffer._pending) == [(1, 11), (2, 11)]
+
+
+async def _concurrent_flushes(id_talk: int, rounds: int) -> tuple[dict, dict, dict]:
+    # Deux workers écrivent la même note (utilisateur, talk) au même moment
+    workers = [FeedbackBuffer(100, 60, 100) for _ in range(2)]
+    for i in range(rounds):
+        for note, worker in enumerate(workers, start=1 + i % 3):
+            worker.submit(_feedback(1, id_talk, note))
+            worker.submit(_feedback(2, id_talk, 6 - note))
+        await asyncio.gather(*(worker.flush() for worker in workers))
+
+    [attendu] = await prisma.query_raw(
+        "SELECT count(*) AS nb, coalesce(sum(note), 0) AS somme "
+        'FROM "Feedback" WHERE id_talk = $1',
+        id_talk,
+    )
+    talk = await prisma.notetalk.find_unique(where={"id_talk": id_talk})
+    conferencier = await prisma.noteconferencier.find_unique(
+        where={"id_conferencier": 2}
+    )
+    return (
+        attendu,
+        {"nb": talk.nb, "somme": talk.somme},
+        {"nb": conferencier.nb, "somme": conferencier.somme},
+    )
+
+
+def test_concurrent_flushes_keep_aggregates_exact(client, donnees):
+    attendu, talk, conferencier = client.portal.call(_concurrent_flushes, 1, 20)
+
+    assert attendu["nb"] == 2
+    assert talk == attendu
+    # Seul le talk 1, du conférencier 2, est noté
+    assert conferencier == attendu
@@ -0,0 +1,23 @@
+"""
+Rendu iCalendar (sans base de données).
+"""
+
+from datetime import datetime, timezone
+from app.core.ical import EvenementIcs, render_calendar
+
+
+def test_talk_times_are_floating():
+    # Prisma renvoie l'heure saisie comme une heure UTC
+    debut = datetime(2025, 6, 2, 10, 0, tzinfo=timezone.utc)
+    evenement = EvenementIcs("talk-1@talkmaster", debut, 45, "Talk", "Salle A", "")
+    lignes = (
+        render_calendar(
+            "Planning", [evenement], datetime(2025, 5, 1, 12, tzinfo=timezone.utc)
+        )
+        .decode()
+        .split("\r\n")
+    )
+
+    assert "DTSTART:20250602T100000" in lignes
+    assert "DTEND:20250602T104500" in lignes
+    assert "DTSTAMP:20250501T120000Z" in lignes
@@ -0,0 +1,36 @@
+"""
+Curseurs de pagination (sans base de données).
+"""
+
+import pytest
+from fastapi import HTTPException
+from app.core.pagination import decode_cursor, encode_cursor, keyset_where
+
+
+@pytest.mark.parametrize(
+    "sort, value", [("id_talk", 12), ("titre", "Talk"), ("duree", 45), ("rank", 0.5)]
+)
+def test_round_trip(sort, value):
+    assert decode_cursor(encode_cursor(sort, value, 12), sort) == (value, 12)
+
+
+@pytest.mark.parametrize(
+    "sort, value, last_id",
+    [
+        ("titre", {"contains": ""}, 1),
+        ("titre", 3, 1),
+        ("duree", "45", 1),
+        ("duree", True, 1),
+        ("rank", [0.5], 1),
+        ("titre", "Talk", "1"),
+    ],
+)
+def test_rejects_unexpected_types(sort, value, last_id):
+    with pytest.raises(HTTPException) as exc:
+        keyset_where(sort, "id_talk", encode_cursor(sort, value, last_id))
+    assert exc.value.status_code == 400
+
+
+def test_rejects_other_sort_key():
+    with pytest.raises(HTTPException):
+        decode_cursor(encode_cursor("titre", "Talk", 1), "duree")
@@ -0,0 +1,62 @@
+"""
+Client Prisma unique et configuration du pool (nécessite `prisma generate`,
+pas de base de données).
+"""
+
+import importlib
+import pkgutil
+from datetime import timedelta
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+import pytest
+import app
+import app.api.routes as routes
+from app.core.config import settings
+from app.core.prisma import _pooled_url, prisma
+
+
+def _query(url: str) -> dict:
+    return parse_qs(urlsplit(url).query)
+
+
+def test_pooled_url_adds_pool_settings():
+    url = _pooled_url("postgresql://u:p@db:5432/talkmaster?schema=public")
+    assert _query(url) == {
+        "schema": ["public"],
+        "connection_limit": [str(settings.DB_POOL_SIZE)],
+        "pool_timeout": [str(settings.DB_POOL_TIMEOUT)],
+    }
+
+
+def test_pooled_url_keeps_explicit_values():
+    url = _pooled_url("postgresql://u:p@db/talkmaster?connection_limit=3")
+    query = _query(url)
+    assert query["connection_limit"] == ["3"]
+    assert query["pool_timeout"] == [str(settings.DB_POOL_TIMEOUT)]
+
+
+def test_shared_client_configuration():
+    assert prisma._connect_timeout == timedelta(seconds=settings.DB_CONNECT_TIMEOUT)
+    if not settings.DATABASE_URL:
+        pytest.skip("DATABASE_URL non défini")
+    assert prisma._datasource == {"url": _pooled_url(settings.DATABASE_URL)}
+
+
+def test_routes_share_one_client():
+    modules = [
+        importlib.import_module(f"{routes.__name__}.{info.name}")
+        for info in pkgutil.iter_modules(routes.__path__)
+    ]
+    clients = [module.prisma for module in modules if hasattr(module, "prisma")]
+    assert clients
+    assert all(client is prisma for client in clients)
+
+
+def test_no_other_client_is_created():
+    racine = Path(app.__path__[0])
+    createurs = [
+        str(path.relative_to(racine))
+        for path in racine.rglob("*.py")
+        if "Prisma(" in path.read_text(encoding="utf-8")
+    ]
+    assert createurs == ["core/prisma.py"]
@@ -0,0 +1,71 @@
+"""
+Nombre maximal de requêtes Prisma par route : un N+1 réintroduit fait
+échouer ces tests. Nécessite TEST_DATABASE_URL (voir conftest.py).
+
+Les budgets comptent l'éventuelle lecture de l'utilisateur par
+l'authentification (cache des principaux froid).
+"""
+
+from tests.conftest import JOUR, NB_PLANIFIES
+
+
+def test_list_talks(client, donnees, query_budget):
+    with query_budget(2):
+        response = client.get(
+            "/api/talks/", params={"limit": 50}, headers=donnees.organisateur
+        )
+    assert response.status_code == 200
+    assert len(response.json()) == NB_PLANIFIES + 1
+
+
+def test_list_talks_cursor_with_total(client, donnees, query_budget):
+    with query_budget(3):
+        response = client.get(
+            "/api/talks/",
+            params={"pagination": "cursor", "limit": 5, "total": True},
+            headers=donnees.organisateur,
+        )
+    assert response.status_code == 200
+    assert response.json()["total"] == NB_PLANIFIES + 1
+
+
+def test_get_planning(client, donnees, query_budget):
+    with query_budget(1):
+        response = client.get("/api/plannings/")
+    assert response.status_code == 200
+    assert len(response.json()) == NB_PLANIFIES
+
+
+def test_get_planning_range(client, donnees, query_budget):
+    debut = JOUR.isoformat()
+    fin = JOUR.replace(hour=23).isoformat()
+    with query_budget(1):
+        response = client.get("/api/plannings/", params={"from": debut, "to": fin})
+    assert response.status_code == 200
+    assert len(response.json()) == NB_PLANIFIES
+
+
+def test_get_filtered_planning(client, donnees, query_budget):
+    with query_budget(2):
+        response = client.get(
+            "/api/plannings/planning",
+            params={"jour": JOUR.date().isoformat()},
+            headers=donnees.organisateur,
+        )
+    assert response.status_code == 200
+    assert len(response.json()) == NB_PLANIFIES
+
+
+def test_schedule_talk(client, donnees, query_budget):
+    with query_budget(7):
+        response = client.patch(
+            f"/api/talks/{donnees.talk_accepte}/schedule",
+            params={
+                "id_salle": donnees.salles[0],
+                "date": JOUR.date().isoformat(),
+                "heure": "18:00",
+            },
+            headers=donnees.organisateur,
+        )
+    assert response.status_code == 200
+    assert response.json()["statut"] == "PLANIFIE"
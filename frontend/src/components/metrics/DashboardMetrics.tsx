@@ -14,22 +14,12 @@ export default function DashboardMetrics() {
   useEffect(() => {
     const fetchData = async () => {
       try {
-        // Récupère le nombre d'utilisateurs
-        const userResponse = await axiosInstance.get("/utilisateurs/");
-        setUserCount(userResponse.data.length); // Assumes the response is an array of users
-
-        // Récupère le nombre de plannings
-        const talkResponse = await axiosInstance.get("/plannings/");
-        setTalkCount(talkResponse.data.length); // Assumes the response is an array of plannings
-
-        // Récupère le nombre de salles
-        const salleResponse = await axiosInstance.get("/salles/");
-        setSalleCount(salleResponse.data.length); // Assumes the response is an array of salles
-
-        // Récupère le nombre de rôles
-        const roleResponse = await axiosInstance.get("/roles/");
-        setRoleCount(roleResponse.data.length); // Assumes the response is an array of roles
-
+        // Un seul appel : les compteurs sont calculés côté serveur
+        const statsResponse = await axiosInstance.get("/stats/");
+        setUserCount(statsResponse.data.utilisateurs);
+        setTalkCount(statsResponse.data.plannings);
+        setSalleCount(statsResponse.data.salles);
+        setRoleCount(statsResponse.data.roles);
       } catch (error) {
         console.error("Erreur lors de la récupération des données:", error);
       }
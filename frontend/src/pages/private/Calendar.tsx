@@ -4,7 +4,7 @@ import Alert from "../../../src/components/ui/alert/Alert";
 import dayGridPlugin from "@fullcalendar/daygrid";
 import timeGridPlugin from "@fullcalendar/timegrid";
 import interactionPlugin from "@fullcalendar/interaction";
-import { EventInput, EventClickArg } from "@fullcalendar/core";
+import { EventInput, EventClickArg, DatesSetArg } from "@fullcalendar/core";
 import { Modal } from "../../../src/components/ui/modal";
 import { useModal } from "../../../src/hooks/useModal";
 import PageMeta from "../../../src/components/common/PageMeta";
@@ -73,9 +73,27 @@ const Calendar: React.FC = () => {
     }
   }, []);
 
-  useEffect(() => {
+  // Ne charge que la plage affichée, à chaque changement de vue
+  const rangeRef = useRef<DatesSetArg | null>(null);
+
+  // Les plannings sont des heures locales sans fuseau : la plage est
+  // envoyée au même format ('YYYY-MM-DDTHH:MM:SS'), pas en UTC
+  const localDateTime = (date: Date) => {
+    const pad = (n: number) => String(n).padStart(2, "0");
+    return (
+      `${date.getFullYear()}-${pad(date.getMonth() + 1)}-${pad(date.getDate())}` +
+      `T${pad(date.getHours())}:${pad(date.getMinutes())}:${pad(date.getSeconds())}`
+    );
+  };
+
+  const handleDatesSet = (arg: DatesSetArg) => {
+    rangeRef.current = arg;
     axiosInstance
-      .get("/plannings", {
+      .get("/plannings/", {
+        params: {
+          from: localDateTime(arg.start),
+          to: localDateTime(arg.end),
+        },
         headers: {
           Authorization: `Bearer ${localStorage.getItem("token")}`,
         },
@@ -84,7 +102,7 @@ const Calendar: React.FC = () => {
         const fetchedEvents = response.data.map((talk: any) => {
           const start = `${talk.date}T${talk.heure}`;
           const end = new Date(
-            new Date(start).getTime() + 30 * 60000
+            new Date(start).getTime() + (talk.talk_duree ?? 30) * 60000
           ).toISOString();
 
           return {
@@ -108,6 +126,50 @@ const Calendar: React.FC = () => {
       .catch((error) => {
         console.error("Erreur lors du chargement des talks", error);
       });
+  };
+
+  // Changements faits par les autres organisateurs, poussés par le serveur
+  useEffect(() => {
+    const source = new EventSource(
+      `${import.meta.env.VITE_BACKEND_URL}/api/plannings/stream`
+    );
+    const reload = () => {
+      if (rangeRef.current) handleDatesSet(rangeRef.current);
+    };
+
+    source.addEventListener("planning.moved", (e) => {
+      const moved = JSON.parse((e as MessageEvent).data);
+      setEvents((current) =>
+        current.map((event) => {
+          if (Number(event.id) !== moved.id_planning) return event;
+          const duration =
+            new Date(event.end as string).getTime() -
+            new Date(event.start as string).getTime();
+          // Heure locale sans fuseau, comme au chargement de la plage
+          const start = `${moved.date}T${moved.heure}`;
+          return {
+            ...event,
+            start,
+            end: new Date(new Date(start).getTime() + duration).toISOString(),
+            extendedProps: { ...event.extendedProps, salle_id: moved.id_salle },
+          };
+        })
+      );
+    });
+    source.addEventListener("talk.status", (e) => {
+      const { id_talk, statut } = JSON.parse((e as MessageEvent).data);
+      setEvents((current) =>
+        current.map((event) =>
+          Number(event.extendedProps.talkId) === id_talk
+            ? { ...event, extendedProps: { ...event.extendedProps, statut } }
+            : event
+        )
+      );
+    });
+    source.addEventListener("planning.created", reload);
+    source.addEventListener("resync", reload);
+
+    return () => source.close();
   }, []);
 
   const handleEventClick = async (clickInfo: EventClickArg) => {
@@ -221,6 +283,7 @@ const Calendar: React.FC = () => {
             center: "title",
           }}
           events={events}
+          datesSet={handleDatesSet}
           eventClick={handleEventClick}
         />
       </div>